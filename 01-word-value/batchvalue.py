@@ -0,0 +1,74 @@
+"""Score many words in one vectorized pass with NumPy.
+
+The words are laid out as one uint8 buffer plus an offsets array, every
+byte is mapped to its letter score with a single table lookup and the
+per-word totals come from a cumulative sum sampled at the word
+boundaries.
+"""
+import numpy as np
+
+from data import LETTER_SCORES
+from wordvalue import compiled_dictionary
+
+# byte -> letter score, anything that isn't a letter scores 0
+SCORE_TABLE = np.zeros(256, dtype=np.int64)
+for letter, score in LETTER_SCORES.items():
+    SCORE_TABLE[ord(letter)] = SCORE_TABLE[ord(letter.lower())] = score
+
+
+def encode_words(words):
+    """Pack words into a uint8 buffer and an offsets array, word i is
+    buf[offsets[i]:offsets[i + 1]]"""
+    encoded = [word.encode() for word in words]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(word) for word in encoded], out=offsets[1:])
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buf, offsets
+
+
+def _dictionary_buffers():
+    # the compiled dictionary is already packed, no need to copy it
+    blob, offsets = compiled_dictionary().packed_words()
+    return (np.frombuffer(blob, dtype=np.uint8),
+            np.frombuffer(offsets, dtype=np.uint32).astype(np.int64))
+
+
+def batch_word_values(words=None):
+    """Return an array with the value of every word, same order as words.
+    If no words are given use the default DICTIONARY"""
+    if words is None:
+        buf, offsets = _dictionary_buffers()
+    else:
+        buf, offsets = encode_words(words)
+    totals = np.zeros(len(buf) + 1, dtype=np.int64)
+    np.cumsum(SCORE_TABLE[buf], out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+
+def _scored(words):
+    if words is None:
+        return compiled_dictionary(), batch_word_values()
+    words = list(words)
+    return words, batch_word_values(words)
+
+
+def batch_max_word_value(words=None):
+    """Vectorized max_word_value: first word with the highest value"""
+    words, values = _scored(words)
+    return words[int(np.argmax(values))]
+
+
+def top_word_values(n, words=None):
+    """Return the n highest (word, value) pairs, best first. Equal values
+    keep the order of words"""
+    words, values = _scored(words)
+    n = min(n, len(values))
+    if n <= 0:
+        return []
+    # value of the nth best word, everything above it is in for sure
+    cutoff = values[np.argpartition(-values, n - 1)[n - 1]]
+    above = np.flatnonzero(values > cutoff)
+    tied = np.flatnonzero(values == cutoff)[:n - len(above)]
+    top = np.concatenate((above, tied))
+    top = top[np.lexsort((top, -values[top]))]
+    return [(words[i], int(values[i])) for i in top]
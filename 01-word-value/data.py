@@ -1,4 +1,5 @@
 DICTIONARY = 'dictionary.txt'
+COMPILED = 'dictionary.bin'  # built from DICTIONARY by dictbin.py
 
 scrabble_scores = [(1, "E A O I N R T L S U"), (2, "D G"), (3, "B C M P"),
                    (4, "F H V W Y"), (5, "K"), (8, "J X"), (10, "Q Z")]
@@ -0,0 +1,189 @@
+"""Compiled, memory-mapped word list.
+
+compile_words() turns a word list into a single binary file, and
+CompiledDictionary maps it read-only so every process using it shares
+the same pages instead of holding its own copy of the words.
+
+File layout (native byte order, every section 4 byte aligned):
+
+    header      magic, word count, size of the word blob
+    offsets     uint32[count + 1]  start of each word in the word blob
+    scores      uint16[count]      precomputed word value
+    order       uint32[count]      word ids sorted by word (for lookups)
+    sig_order   uint32[count]      word ids sorted by anagram signature
+    words       the words, each followed by a newline
+    signatures  each word's anagram signature, same offsets as words
+
+The newlines let words() decode and split the whole blob in one go.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'WORDBN2' + sys.byteorder[0].upper().encode()
+HEADER = struct.Struct('8sII')
+
+
+def signature(word):
+    """Anagram signature of a word: its letters, lowercased and sorted"""
+    return ''.join(sorted(word.lower()))
+
+
+def _pad(size):
+    return -size % 4
+
+
+def compile_words(words, path, score):
+    """Write words (in the given order) to path in the compiled format,
+    using score(word) for the precomputed values"""
+    encoded = [word.encode() for word in words]
+    sigs = [signature(word).encode() for word in words]
+    ids = range(len(encoded))
+
+    offsets = array('I', [0])
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word) + 1)
+    scores = array('H', (score(word) for word in words))
+    order = array('I', sorted(ids, key=encoded.__getitem__))
+    sig_order = array('I', sorted(ids, key=sigs.__getitem__))
+
+    # write next to the target and rename, so readers never see half a file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded), offsets[-1]))
+        for section in (offsets, scores, order, sig_order):
+            data = section.tobytes()
+            f.write(data + b'\0' * _pad(len(data)))
+        f.write(b''.join(word + b'\n' for word in encoded))
+        f.write(b''.join(sig + b'\n' for sig in sigs))
+    os.replace(tmp, path)
+
+
+class CompiledDictionary:
+    """Read-only view of a compiled word list: supports len(), indexing,
+    iteration (in compiled order) and fast `word in dictionary` checks"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, blob_size = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a compiled dictionary')
+
+        view = memoryview(self._mm)
+        pos = HEADER.size
+
+        def section(fmt, length):
+            nonlocal pos
+            size = length * struct.calcsize(fmt)
+            data = view[pos:pos + size].cast(fmt)
+            pos += size + _pad(size)
+            return data
+
+        self._offsets = section('I', count + 1)
+        self.scores = section('H', count)
+        self._order = section('I', count)
+        self._sig_order = section('I', count)
+        self._words = pos
+        self._sigs = pos + blob_size
+
+    def __len__(self):
+        return len(self.scores)
+
+    def _word_bytes(self, i, base=None):
+        base = self._words if base is None else base
+        # leave out the newline
+        start, end = self._offsets[i], self._offsets[i + 1] - 1
+        return self._mm[base + start:base + end]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('word index out of range')
+        return self._word_bytes(i).decode()
+
+    def __iter__(self):
+        return iter(self.words())
+
+    def words(self):
+        """All words as a list, in compiled order"""
+        if not len(self):
+            return []
+        return self._mm[self._words:self._sigs - 1].decode().split('\n')
+
+    def _bisect(self, ids, key, base=None):
+        """First position in ids whose word (or signature) is >= key"""
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(ids[mid], base) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def index(self, word):
+        """Id of word, raise ValueError if it's not in the dictionary"""
+        key = word.encode()
+        pos = self._bisect(self._order, key)
+        if pos < len(self) and self._word_bytes(self._order[pos]) == key:
+            return self._order[pos]
+        raise ValueError(f'{word!r} is not in the dictionary')
+
+    def __contains__(self, word):
+        try:
+            self.index(word)
+        except ValueError:
+            return False
+        return True
+
+    def score(self, i):
+        return self.scores[i]
+
+    def anagram_ids(self, sig):
+        """Ids of all words with anagram signature sig"""
+        key = sig.encode()
+        pos = self._bisect(self._sig_order, key, self._sigs)
+        ids = []
+        while (pos < len(self) and
+               self._word_bytes(self._sig_order[pos], self._sigs) == key):
+            ids.append(self._sig_order[pos])
+            pos += 1
+        return ids
+
+    def anagrams(self, sig):
+        """All words with anagram signature sig"""
+        return [self[i] for i in self.anagram_ids(sig)]
+
+    def packed_words(self):
+        """The raw word blob and the uint32 offsets into it, for callers
+        that want to process every word at once without decoding them.
+        Every word in the blob is followed by a newline."""
+        blob = memoryview(self._mm)[self._words:self._sigs]
+        return blob, self._offsets
+
+
+def load_compiled(source, target, read_words, score):
+    """Open the compiled dictionary at target, (re)building it from
+    read_words() first if it is missing, older than source or in an
+    older format"""
+    if (os.path.exists(target) and
+            os.path.getmtime(target) >= os.path.getmtime(source)):
+        try:
+            return CompiledDictionary(target)
+        except ValueError:
+            pass
+    compile_words(read_words(), target, score)
+    return CompiledDictionary(target)
+
+
+if __name__ == "__main__":
+    # build step, run whenever dictionary.txt changes
+    from data import COMPILED, DICTIONARY
+    from wordvalue import calc_word_value, read_words
+
+    compile_words(read_words(), COMPILED, calc_word_value)
+    print(f'compiled {DICTIONARY} -> {COMPILED}')
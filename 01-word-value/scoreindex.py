@@ -0,0 +1,81 @@
+"""Answer leaderboard style queries on word values without rescanning
+the dictionary: top n words, optionally limited by length or required
+letters."""
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+
+from wordvalue import calc_word_value, compiled_dictionary
+
+
+class WordScoreIndex:
+    """Words ranked by value (equal values keep dictionary order), with
+    the ranking also bucketed per word length and per (letter, length).
+
+    Entries are (rank, value, word) tuples so every bucket is already
+    sorted best first and buckets can be lazily merged."""
+
+    def __init__(self, words=None):
+        if words is None:
+            # use the values precomputed in the compiled dictionary
+            compiled = compiled_dictionary()
+            scored = [(compiled.score(i), i, word)
+                      for i, word in enumerate(compiled)]
+        else:
+            scored = [(calc_word_value(word), i, word)
+                      for i, word in enumerate(words)]
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+
+        self._ranked = []
+        self._by_length = defaultdict(list)
+        self._by_letter = defaultdict(dict)  # letter -> length -> bucket
+        for rank, (value, _, word) in enumerate(scored):
+            entry = (rank, value, word)
+            self._ranked.append(entry)
+            self._by_length[len(word)].append(entry)
+            for letter in set(word.upper()):
+                if letter.isalpha():
+                    self._by_letter[letter].setdefault(
+                        len(word), []).append(entry)
+
+    def __len__(self):
+        return len(self._ranked)
+
+    @staticmethod
+    def _in_range(buckets, min_length, max_length):
+        return [bucket for length, bucket in buckets.items()
+                if (min_length is None or length >= min_length) and
+                (max_length is None or length <= max_length)]
+
+    def _candidates(self, min_length, max_length, containing):
+        """Ranked entries that can hold every match: the length buckets
+        in range of the rarest letter in containing, or of all words,
+        lazily merged"""
+        if containing:
+            buckets = min((self._in_range(self._by_letter.get(letter, {}),
+                                          min_length, max_length)
+                           for letter in containing),
+                          key=lambda buckets: sum(map(len, buckets)))
+        elif min_length is None and max_length is None:
+            return self._ranked
+        else:
+            buckets = self._in_range(self._by_length, min_length, max_length)
+        return merge(*buckets)
+
+    def top(self, n=10, min_length=None, max_length=None, containing=''):
+        """Return the n best (word, value) pairs, best first, only using
+        words with min_length <= len(word) <= max_length that contain
+        every letter in containing"""
+        containing = set(containing.upper())
+        candidates = self._candidates(min_length, max_length, containing)
+        matches = (
+            (word, value) for _, value, word in candidates
+            if (min_length is None or len(word) >= min_length) and
+            (max_length is None or len(word) <= max_length) and
+            containing <= set(word.upper()))
+        return list(islice(matches, n))
+
+    def best(self, **filters):
+        """Best (word, value) pair matching filters (see top), or None"""
+        top = self.top(1, **filters)
+        return top[0] if top else None
@@ -0,0 +1,41 @@
+import unittest
+
+from batchvalue import batch_word_values, batch_max_word_value
+from batchvalue import top_word_values
+from wordvalue import calc_word_value, load_words, max_word_value
+
+TEST_WORDS = ('bob', 'julian', 'pybites', 'quit', 'barbeque')
+
+
+class TestBatchValue(unittest.TestCase):
+
+    def test_batch_word_values(self):
+        self.assertEqual(list(batch_word_values(TEST_WORDS)),
+                         [calc_word_value(word) for word in TEST_WORDS])
+        self.assertEqual(list(batch_word_values(['', 'Jean-Pierre'])),
+                         [0, calc_word_value('Jean-Pierre')])
+
+    def test_dictionary_values(self):
+        values = batch_word_values()
+        words = load_words()
+        self.assertEqual(len(values), len(words))
+        for i in range(0, len(words), 997):
+            self.assertEqual(values[i], calc_word_value(words[i]))
+
+    def test_batch_max_word_value(self):
+        self.assertEqual(batch_max_word_value(TEST_WORDS), 'barbeque')
+        self.assertEqual(batch_max_word_value(), max_word_value())
+
+    def test_top_word_values(self):
+        self.assertEqual(top_word_values(2, TEST_WORDS),
+                         [('barbeque', 21), ('pybites', 14)])
+        # ties keep their original order
+        self.assertEqual(top_word_values(2, ['ab', 'ba', 'ab']),
+                         [('ab', 4), ('ba', 4)])
+        top = top_word_values(3)
+        self.assertEqual(top[0], ('benzalphenylhydrazone', 56))
+        self.assertEqual(len(top), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from scoreindex import WordScoreIndex
+from wordvalue import calc_word_value, max_word_value
+
+TEST_WORDS = ('bob', 'julian', 'pybites', 'quit', 'barbeque')
+
+
+def expected_best(index, letter, max_length):
+    return next((word, value) for word, value in index.top(len(index))
+                if len(word) <= max_length and letter in word.lower())
+
+
+class TestWordScoreIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = WordScoreIndex()
+
+    def test_top(self):
+        index = WordScoreIndex(TEST_WORDS)
+        self.assertEqual(index.top(3), [('barbeque', 21), ('pybites', 14),
+                                        ('julian', 13)])
+        # quit and julian both score 13, dictionary order wins
+        self.assertEqual(index.top(4)[-1], ('quit', 13))
+        self.assertEqual(len(index.top(50)), len(TEST_WORDS))
+
+    def test_filters(self):
+        index = WordScoreIndex(TEST_WORDS)
+        self.assertEqual(index.best(max_length=4), ('quit', 13))
+        self.assertEqual(index.best(containing='q'), ('barbeque', 21))
+        self.assertEqual(index.best(containing='QI'), ('quit', 13))
+        self.assertEqual(index.best(min_length=6, max_length=6),
+                         ('julian', 13))
+        self.assertIsNone(index.best(containing='z'))
+
+    def test_dictionary(self):
+        word, value = self.index.best()
+        self.assertEqual(word, max_word_value())
+        self.assertEqual(len(self.index.top(50)), 50)
+        word, value = self.index.best(max_length=5, containing='Q')
+        self.assertLessEqual(len(word), 5)
+        self.assertIn('q', word.lower())
+        self.assertEqual(value, calc_word_value(word))
+
+    def test_letter_and_length(self):
+        top = self.index.top(5, min_length=3, max_length=4, containing='ez')
+        ranked = self.index.top(len(self.index))
+        expected = [(word, value) for word, value in ranked
+                    if 3 <= len(word) <= 4 and {'e', 'z'} <= set(word.lower())]
+        self.assertEqual(top, expected[:5])
+        self.assertEqual(self.index.best(containing='e', max_length=2),
+                         expected_best(self.index, 'e', 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
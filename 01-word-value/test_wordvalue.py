@@ -2,6 +2,7 @@ import unittest
 
 from data import DICTIONARY, LETTER_SCORES
 from wordvalue import load_words, calc_word_value, max_word_value
+from wordvalue import compiled_dictionary, read_words
 
 TEST_WORDS = ('bob', 'julian', 'pybites', 'quit', 'barbeque')
 
@@ -20,6 +21,16 @@ class TestWordValue(unittest.TestCase):
         self.assertEqual(calc_word_value('PyBites'), 14)
         self.assertEqual(calc_word_value('benzalphenylhydrazone'), 56)
 
+    def test_compiled_dictionary(self):
+        words = compiled_dictionary()
+        self.assertIn('Zyzzogeton', words)
+        self.assertIn('Jean-Pierre', words)
+        self.assertNotIn('pybites', words)
+        self.assertEqual(words.score(words.index('quit')), 13)
+        self.assertEqual(words.anagrams('abt'), ['Bat', 'bat', 'Tab', 'tab'])
+        self.assertEqual(words.words(), read_words())
+        self.assertEqual(words[1], 'a')
+
     def test_max_word_value(self):
         self.assertEqual(max_word_value(TEST_WORDS), 'barbeque')
         self.assertEqual(max_word_value(), 'benzalphenylhydrazone')
@@ -1,8 +1,11 @@
-from data import DICTIONARY, LETTER_SCORES
+from functools import lru_cache
 
+from data import COMPILED, DICTIONARY, LETTER_SCORES
+from dictbin import load_compiled
 
-def load_words():
-    """Load dictionary into a list and return list"""
+
+def read_words():
+    """Read the plain text DICTIONARY into a list"""
     words = []
     with open(DICTIONARY, 'r') as dict_file:
         for line in dict_file:
@@ -10,6 +13,17 @@ def load_words():
     return words
 
 
+@lru_cache(maxsize=None)
+def compiled_dictionary():
+    """The memory-mapped compiled DICTIONARY, built on first use"""
+    return load_compiled(DICTIONARY, COMPILED, read_words, calc_word_value)
+
+
+def load_words():
+    """Load dictionary into a list and return list"""
+    return compiled_dictionary().words()
+
+
 def calc_word_value(word):
     """Calculate the value of the word entered into function
     using imported constant mapping LETTER_SCORES"""
@@ -25,7 +39,10 @@ def max_word_value(words=None):
     """Calculate the word with the max value, can receive a list
     of words as arg, if none provided uses default DICTIONARY"""
     if words is None:
-        words = load_words()
+        # scores were precomputed when the dictionary was compiled
+        compiled = compiled_dictionary()
+        best = max(range(len(compiled)), key=compiled.score)
+        return compiled[best]
     max_value = [0, ""]
     for word in words:
         word_val = calc_word_value(word)
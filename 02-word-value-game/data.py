@@ -1,13 +1,16 @@
 from collections import namedtuple
 
+from dictbin import load_compiled
+
 Letter = namedtuple('Letter', 'name amount value')
 
-def _load_words():
-    with open('dictionary.txt') as f:
-        return set([word.strip().lower() for word in f.read().split()])
+DICTIONARY_TXT = 'dictionary.txt'
+COMPILED = 'dictionary.bin'  # built from DICTIONARY_TXT by dictbin.py
 
-DICTIONARY = _load_words()
-assert len(DICTIONARY) == 234371
+
+def read_words():
+    with open(DICTIONARY_TXT) as f:
+        return sorted(set([word.strip().lower() for word in f.read().split()]))
 
 
 # generated with https://github.com/pybites/blog_code/blob/master/BeautifulSoup/scrabble_distribution.py
@@ -28,3 +31,12 @@ LETTER_SCORES = dict(zip(
 assert LETTER_SCORES['A'] == 1
 assert LETTER_SCORES['Q'] == 10
 assert sum(LETTER_SCORES.values()) == 87
+
+
+def word_value(word):
+    return sum(LETTER_SCORES.get(char.upper(), 0) for char in word)
+
+
+# mmapped, so every game process shares one copy of the words
+DICTIONARY = load_compiled(DICTIONARY_TXT, COMPILED, read_words, word_value)
+assert len(DICTIONARY) == 234371
@@ -0,0 +1,165 @@
+"""Directed acyclic word graph (a trie with shared suffixes merged)
+and a rack-constrained search for the best scoring word in it."""
+from collections import Counter
+
+BLANK = '?'
+
+
+class Node:
+    # mask: bit set of letters somewhere below this node
+    # depth: length of the longest word suffix below this node
+    __slots__ = ('edges', 'final', 'mask', 'depth')
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+        self.mask = 0
+        self.depth = 0
+
+    def key(self):
+        # children are already unique when this is asked, so ids will do
+        return self.final, tuple((letter, id(child)) for letter, child
+                                 in sorted(self.edges.items()))
+
+
+def _annotate(node, done):
+    """Fill in mask and depth bottom up, shared nodes only once"""
+    for letter, child in node.edges.items():
+        if id(child) not in done:
+            _annotate(child, done)
+        node.mask |= child.mask | 1 << ord(letter)
+        node.depth = max(node.depth, child.depth + 1)
+    done.add(id(node))
+
+
+class Dawg:
+    """Build with words in sorted order, identical subtrees get shared
+    as soon as no later word can extend them"""
+
+    def __init__(self, words):
+        self.root = Node()
+        self._registry = {}
+        self._unchecked = []  # (parent, letter, child) not yet shared
+        previous = ''
+        for word in words:
+            if word <= previous:
+                raise ValueError('words must be unique and sorted')
+            self._insert(word, previous)
+            previous = word
+        self._minimize(0)
+        self.nodes = len(self._registry) + 1
+        del self._registry, self._unchecked
+        _annotate(self.root, set())
+
+    def _insert(self, word, previous):
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        self._minimize(common)
+
+        node = self._unchecked[-1][2] if self._unchecked else self.root
+        for letter in word[common:]:
+            child = Node()
+            node.edges[letter] = child
+            self._unchecked.append((node, letter, child))
+            node = child
+        node.final = True
+
+    def _minimize(self, down_to):
+        while len(self._unchecked) > down_to:
+            parent, letter, child = self._unchecked.pop()
+            key = child.key()
+            if key in self._registry:
+                parent.edges[letter] = self._registry[key]
+            else:
+                self._registry[key] = child
+
+    def __contains__(self, word):
+        node = self.root
+        for letter in word:
+            node = node.edges.get(letter)
+            if node is None:
+                return False
+        return node.final
+
+    def words(self, letters):
+        """Yield every word that can be made from letters (BLANK tiles
+        stand in for any letter)"""
+        rack = Counter(char.lower() for char in letters if char != BLANK)
+        blanks = sum(1 for char in letters if char == BLANK)
+        path = []
+
+        def walk(node):
+            nonlocal blanks
+            if node.final:
+                yield ''.join(path)
+            for letter, child in node.edges.items():
+                if rack[letter]:
+                    rack[letter] -= 1
+                    path.append(letter)
+                    yield from walk(child)
+                    path.pop()
+                    rack[letter] += 1
+                elif blanks:
+                    blanks -= 1
+                    path.append(letter)
+                    yield from walk(child)
+                    path.pop()
+                    blanks += 1
+
+        yield from walk(self.root)
+
+    def best_word(self, letters, letter_scores):
+        """Return (word, value) for the highest value word that can be
+        made from letters, BLANK tiles stand in for any letter and score
+        0. Return (None, 0) if no word can be made."""
+        rack = Counter(char.lower() for char in letters if char != BLANK)
+        blanks = sum(1 for char in letters if char == BLANK)
+        values = {letter: letter_scores.get(letter.upper(), 0)
+                  for letter in rack}
+        # most valuable first, so good words are found (and prune) early
+        order = sorted(rack, key=values.get, reverse=True)
+        best = [None, -1]
+        path = []
+
+        def bound(node):
+            """Most value the tiles left could still add below node"""
+            extra, room = 0, node.depth
+            for letter in order:
+                if not room:
+                    break
+                if rack[letter] and node.mask & 1 << ord(letter):
+                    used = min(rack[letter], room)
+                    extra += used * values[letter]
+                    room -= used
+            return extra
+
+        def walk(node, value):
+            nonlocal blanks
+            if node.final and value > best[1]:
+                best[:] = ''.join(path), value
+            if value + bound(node) <= best[1]:
+                return
+            for letter in order:
+                child = node.edges.get(letter)
+                if child is not None and rack[letter]:
+                    rack[letter] -= 1
+                    path.append(letter)
+                    walk(child, value + values[letter])
+                    path.pop()
+                    rack[letter] += 1
+            if not blanks:
+                return
+            # a blank is only worth playing where no real tile fits
+            blanks -= 1
+            for letter, child in node.edges.items():
+                if not rack[letter]:
+                    path.append(letter)
+                    walk(child, value)
+                    path.pop()
+            blanks += 1
+
+        walk(self.root, 0)
+        return tuple(best) if best[0] else (None, 0)
@@ -0,0 +1,167 @@
+"""Compiled, memory-mapped word list (re-use from challenge 01, without
+the anagram index the DAWG made unnecessary).
+
+compile_words() turns a word list into a single binary file, and
+CompiledDictionary maps it read-only so every process using it shares
+the same pages instead of holding its own copy of the words.
+
+File layout (native byte order, every section 4 byte aligned):
+
+    header      magic, word count, size of the word blob
+    offsets     uint32[count + 1]  start of each word in the word blob
+    scores      uint16[count]      precomputed word value
+    slots       uint32[_table_size(count)]  hash table for lookups:
+                id + 1 of a word, at crc32(word) or after it, 0 if empty
+    words       the words, each followed by a newline
+
+The newlines let words() decode and split the whole blob in one go.
+Lookups hash the word and compare it with the mapped words in its slots,
+at most a few of them, without a copy of the word list per process.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b'WORDBN3' + sys.byteorder[0].upper().encode()
+HEADER = struct.Struct('8sII')
+
+
+def _pad(size):
+    return -size % 4
+
+
+def _table_size(count):
+    """Power of two at least twice count, so probes stay short"""
+    size = 1
+    while size < 2 * count:
+        size *= 2
+    return size
+
+
+def compile_words(words, path, score):
+    """Write words (in the given order) to path in the compiled format,
+    using score(word) for the precomputed values"""
+    encoded = [word.encode() for word in words]
+    ids = range(len(encoded))
+
+    offsets = array('I', [0])
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word) + 1)
+    scores = array('H', (score(word) for word in words))
+    slots = array('I', bytes(4 * _table_size(len(encoded))))
+    mask = len(slots) - 1
+    for i in ids:
+        slot = zlib.crc32(encoded[i]) & mask
+        while slots[slot]:  # linear probing
+            slot = (slot + 1) & mask
+        slots[slot] = i + 1
+
+    # write next to the target and rename, so readers never see half a file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded), offsets[-1]))
+        for section in (offsets, scores, slots):
+            data = section.tobytes()
+            f.write(data + b'\0' * _pad(len(data)))
+        f.write(b''.join(word + b'\n' for word in encoded))
+    os.replace(tmp, path)
+
+
+class CompiledDictionary:
+    """Read-only view of a compiled word list: supports len(), indexing,
+    iteration (in compiled order) and fast `word in dictionary` checks"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, blob_size = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a compiled dictionary')
+
+        view = memoryview(self._mm)
+        pos = HEADER.size
+
+        def section(fmt, length):
+            nonlocal pos
+            size = length * struct.calcsize(fmt)
+            data = view[pos:pos + size].cast(fmt)
+            pos += size + _pad(size)
+            return data
+
+        self._offsets = section('I', count + 1)
+        self.scores = section('H', count)
+        self._slots = section('I', _table_size(count))
+        self._words = pos
+        self._end = pos + blob_size
+
+    def __len__(self):
+        return len(self.scores)
+
+    def _word_bytes(self, i):
+        # leave out the newline
+        start, end = self._offsets[i], self._offsets[i + 1] - 1
+        return self._mm[self._words + start:self._words + end]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('word index out of range')
+        return self._word_bytes(i).decode()
+
+    def __iter__(self):
+        return iter(self.words())
+
+    def words(self):
+        """All words as a list, in compiled order"""
+        if not len(self):
+            return []
+        return self._mm[self._words:self._end - 1].decode().split('\n')
+
+    def index(self, word):
+        """Id of word, raise ValueError if it's not in the dictionary"""
+        key = word.encode()
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = zlib.crc32(key) & mask
+        while slots[slot]:
+            i = slots[slot] - 1
+            if self._word_bytes(i) == key:
+                return i
+            slot = (slot + 1) & mask
+        raise ValueError(f'{word!r} is not in the dictionary')
+
+    def __contains__(self, word):
+        try:
+            self.index(word)
+        except ValueError:
+            return False
+        return True
+
+    def score(self, i):
+        return self.scores[i]
+
+
+def load_compiled(source, target, read_words, score):
+    """Open the compiled dictionary at target, (re)building it from
+    read_words() first if it is missing, older than source or in an
+    older format"""
+    if (os.path.exists(target) and
+            os.path.getmtime(target) >= os.path.getmtime(source)):
+        try:
+            return CompiledDictionary(target)
+        except ValueError:
+            pass
+    compile_words(read_words(), target, score)
+    return CompiledDictionary(target)
+
+
+if __name__ == "__main__":
+    # build step, run whenever dictionary.txt changes
+    from data import COMPILED, DICTIONARY_TXT, read_words, word_value
+
+    compile_words(read_words(), COMPILED, word_value)
+    print(f'compiled {DICTIONARY_TXT} -> {COMPILED}')
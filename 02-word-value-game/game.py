@@ -3,11 +3,15 @@
 # http://pybit.es/codechallenge02.html
 
 # TODO: Make Scrabble GUI?
-from data import DICTIONARY, LETTER_SCORES, POUCH
-import random, itertools, sys, shelve, getpass
+from data import DICTIONARY, LETTER_SCORES
+from dawg import BLANK, Dawg
+from functools import lru_cache
+from pouch import Pouch, VOWELS
+from scorestore import SQLiteScoreStore
+import random, sys, getpass
 
 NUM_LETTERS = 7
-VOWELS = {'A', 'E', 'I', 'O', 'U'}
+SCORE_DB = 'scores.db'
 
 
 # re-use from challenge 01
@@ -22,28 +26,43 @@ def max_word_value(words):
     return max(words, key=calc_word_value)
 
 
-def draw_letters(amount=NUM_LETTERS, vowel_check=True):
-    # Pick amount of letters from POUCH and return as list.
-    letters = [random.choice(POUCH) for i in range(amount)]
+def draw_letters(amount=NUM_LETTERS, vowel_check=True, pouch=None,
+                 rng=random):
+    # Take amount of letters out of the pouch (a full one if not given)
+    # and return as list.
+    if pouch is None:
+        pouch = Pouch(rng=rng)
 
-    # Make sure got vowel, otherwise pick amount again
-    if not vowel_check and not has_vowels(letters):
-        print(f'no vowels in {letters}, trying again')
-        letters = draw_letters(amount)
-    return letters
+    # Make sure got vowel, otherwise put them back and draw again
+    return pouch.draw(amount, need_vowel=vowel_check)
+
+
+@lru_cache(maxsize=None)
+def word_graph():
+    """DAWG of the DICTIONARY, built on first use (takes a few seconds)"""
+    return Dawg(DICTIONARY)
+
+
+def find_best_move(curr_letters):
+    """Return (word, value) of the best word on the rack, BLANK tiles
+    can be any letter but score 0"""
+    return word_graph().best_word(curr_letters, LETTER_SCORES)
 
 
 def find_optimal_word(curr_letters):
-    possible_words = []
-    for r in range(1, len(curr_letters)):
-        for possible_word in itertools.permutations(curr_letters, r=r):
-            # tuple to lowercase string
-            possible_word = ''.join(str(char)
-                                    for char in possible_word).lower()
-            if possible_word in DICTIONARY:
-                possible_words.append(possible_word)
+    return find_best_move(curr_letters)[0]
 
-    return max_word_value(possible_words)
+
+def take_tiles(letters, word):
+    """Remove the tiles needed for word from letters, falling back to a
+    BLANK for letters not on the rack. Return the tiles used, raise
+    ValueError if the word can't be made"""
+    tiles = []
+    for char in word.upper():
+        tile = char if char in letters else BLANK
+        letters.remove(tile)
+        tiles.append(tile)
+    return tiles
 
 
 def is_valid(_letters, word=None):
@@ -53,12 +72,11 @@ def is_valid(_letters, word=None):
         print(f'{word} is not a dictionary word... Try Again!\n')
         return False
     # Must be made from current letters, and only once
-    for char in word.upper():
-        if char in letters:
-            letters.remove(char)
-        else:
-            print('Use the letters given... Try Again!\n')
-            return False
+    try:
+        take_tiles(letters, word)
+    except ValueError:
+        print('Use the letters given... Try Again!\n')
+        return False
     return True
 
 
@@ -66,25 +84,20 @@ def has_vowels(letters):
     return set(letters) & VOWELS
 
 
-def calculate_score(word, best_word_val):
+def calculate_score(word, best_word_val, verbose=True):
     total = calc_word_value(word)
     # Keep this check first.
     if total == best_word_val:
-        print('Just as good as optimal!')
+        if verbose:
+            print('Just as good as optimal!')
         total += 3
     if len(word) == NUM_LETTERS:
-        print('Used all letters!')
+        if verbose:
+            print('Used all letters!')
         total += 5
     return total
 
 
-def save(word, score):
-    with shelve.open('app') as db:
-        user = getpass.getuser()
-        print(f'saving new best... {word} for {score} pts!!')
-        db[user] = {'score': score, 'word': word}
-
-
 def app_exit():
     print("Thanks for playing!!")
     sys.exit()
@@ -103,44 +116,48 @@ def main():
     draw_amt = NUM_LETTERS
     curr_letters = []
     user_max_score = 0
+    pouch = Pouch()
 
-    with shelve.open('app') as db:
+    # write every play straight away, other games may share the store
+    with SQLiteScoreStore(SCORE_DB, batch_size=1) as store:
         user = getpass.getuser()
-        res = db.setdefault(user, {'word': None, 'score': 0})
-        user_max_score = db[user]['score']
-
+        user_max_score = store.best(user)['score']
         print(f"{user}'s current best is {user_max_score}")
 
-    while True:
-        # Draw new letters
-        vowel_status = has_vowels(curr_letters)
-        curr_letters.extend(draw_letters(draw_amt, vowel_check=vowel_status))
-
-        # Get user input
-        user_word = None
-        while not user_word or not is_valid(curr_letters, user_word):
-            user_word = input(
-                f'Here are your letters. Craft a word! \n{curr_letters}\n '
-            ).lower()
-
-        # Calculate word values vs optimal
-        best_word = find_optimal_word(curr_letters)
-        best_word_val = calc_word_value(best_word)
-        user_score = calculate_score(user_word, best_word_val)
-        grade = user_score / best_word_val
-        print(f'You scored: {user_score} with {user_word}')
-        print(f'The best word was {best_word} and scored {best_word_val}')
-        print(f'Your grade: %.02f ' % grade)
-
-        if user_score > user_max_score:
-            save(user_word, user_score)
-            user_max_score = user_score
-        print(f'****************\n\n')
-
-        # Set up for next loop
-        draw_amt = len(user_word)
-        for char in user_word:
-            curr_letters.remove(char.upper())
+        while True:
+            # Draw new letters, need a vowel if there's none left
+            vowel_check = not has_vowels(curr_letters)
+            curr_letters.extend(
+                draw_letters(draw_amt, vowel_check=vowel_check, pouch=pouch))
+
+            best_word, best_word_val = find_best_move(curr_letters)
+            if best_word is None:
+                print(f'No words left to make from {curr_letters}, game over!')
+                break
+
+            # Get user input
+            user_word = None
+            while not user_word or not is_valid(curr_letters, user_word):
+                user_word = input(
+                    f'Here are your letters. Craft a word! \n{curr_letters}\n '
+                ).lower()
+
+            # Calculate word values vs optimal
+            tiles = take_tiles(curr_letters, user_word)
+            user_score = calculate_score(''.join(tiles), best_word_val)
+            grade = user_score / best_word_val
+            print(f'You scored: {user_score} with {user_word}')
+            print(f'The best word was {best_word} and scored {best_word_val}')
+            print(f'Your grade: %.02f ' % grade)
+
+            store.record(user, user_word, user_score)
+            if user_score > user_max_score:
+                print(f'new best... {user_word} for {user_score} pts!!')
+                user_max_score = user_score
+            print(f'****************\n\n')
+
+            # Set up for next loop
+            draw_amt = len(user_word)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""The bag of tiles, drawn from without replacement."""
+import random
+from collections import Counter
+
+from data import POUCH
+
+VOWELS = {'A', 'E', 'I', 'O', 'U'}
+MAX_VOWEL_RETRIES = 10
+
+
+class Pouch:
+    """Tiles left in the bag with counts per letter. Drawing picks a
+    random tile and swaps it out with the last one, so every draw is O(1)
+    and letters come out weighted by how many of them are left."""
+
+    def __init__(self, tiles=POUCH, rng=random):
+        self._tiles = list(tiles)
+        self.counts = Counter(self._tiles)
+        self.rng = rng
+        self.draws = 0
+        self.vowel_retries = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __repr__(self):
+        return f'Pouch({len(self)} tiles)'
+
+    def _take(self):
+        i = self.rng.randrange(len(self._tiles))
+        tiles = self._tiles
+        tiles[i], tiles[-1] = tiles[-1], tiles[i]
+        tile = tiles.pop()
+        self.counts[tile] -= 1
+        return tile
+
+    def put_back(self, tiles):
+        """Return tiles to the pouch"""
+        self._tiles.extend(tiles)
+        self.counts.update(tiles)
+
+    def has_vowels(self):
+        return any(self.counts[vowel] for vowel in VOWELS)
+
+    def draw(self, amount, need_vowel=False, retries=MAX_VOWEL_RETRIES):
+        """Draw up to amount tiles (fewer if the pouch runs out). With
+        need_vowel, a draw without vowels goes back in the pouch and is
+        retried, at most retries times and only while vowels are left."""
+        self.draws += 1
+        letters = [self._take() for _ in range(min(amount, len(self)))]
+        while (need_vowel and retries and not set(letters) & VOWELS and
+               self.has_vowels()):
+            self.put_back(letters)
+            letters = [self._take() for _ in range(len(letters))]
+            self.vowel_retries += 1
+            retries -= 1
+        return letters
@@ -0,0 +1,146 @@
+"""High score storage for the word game.
+
+ScoreStore is the interface the game talks to. ShelveScoreStore keeps
+the original shelve file (best score per user only), SQLiteScoreStore
+is safe to share between many concurrent game processes.
+"""
+import shelve
+import sqlite3
+import time
+
+BATCH_SIZE = 100
+
+
+class ScoreStore:
+    """Base class for score backends, usable as a context manager"""
+
+    def record(self, user, word, score):
+        """Store a played word and its score"""
+        raise NotImplementedError
+
+    def best(self, user):
+        """Return {'word': ..., 'score': ...} for user's best play"""
+        raise NotImplementedError
+
+    def leaderboard(self, n=10):
+        """Return [(user, word, score)] for the n best users"""
+        raise NotImplementedError
+
+    def history(self, user, n=10):
+        """Return [(word, score, played_at)] for user, newest first"""
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ShelveScoreStore(ScoreStore):
+    """The original storage: one pickled best record per user"""
+
+    def __init__(self, path='app'):
+        self.path = path
+
+    def record(self, user, word, score):
+        with shelve.open(self.path) as db:
+            if score > db.get(user, {'score': 0})['score']:
+                db[user] = {'score': score, 'word': word}
+
+    def best(self, user):
+        with shelve.open(self.path) as db:
+            return db.get(user, {'word': None, 'score': 0})
+
+    def leaderboard(self, n=10):
+        with shelve.open(self.path) as db:
+            top = sorted(db.items(), key=lambda item: -item[1]['score'])
+            return [(user, best['word'], best['score'])
+                    for user, best in top[:n]]
+
+    def history(self, user, n=10):
+        # shelve only ever kept the best play
+        best = self.best(user)
+        return [(best['word'], best['score'], None)] if best['word'] else []
+
+
+class SQLiteScoreStore(ScoreStore):
+    """Scores in a SQLite database in WAL mode, so readers never block
+    the writer and many game processes can share one file. Plays are
+    buffered and written batch_size at a time in one transaction."""
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS plays (
+            user TEXT NOT NULL,
+            word TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            played_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS plays_user
+            ON plays (user, played_at DESC);
+        CREATE TABLE IF NOT EXISTS best (
+            user TEXT PRIMARY KEY,
+            word TEXT NOT NULL,
+            score INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS best_score ON best (score DESC);
+    '''
+
+    def __init__(self, path='scores.db', batch_size=BATCH_SIZE, timeout=30):
+        self.batch_size = batch_size
+        self._pending = []
+        self.db = sqlite3.connect(path, timeout=timeout)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        with self.db:
+            self.db.executescript(self.SCHEMA)
+
+    def record(self, user, word, score):
+        self._pending.append((user, word, score, time.time()))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.db:
+            self.db.executemany(
+                'INSERT INTO plays (user, word, score, played_at) '
+                'VALUES (?, ?, ?, ?)', self._pending)
+            self.db.executemany(
+                'INSERT INTO best (user, word, score) VALUES (?, ?, ?) '
+                'ON CONFLICT (user) DO UPDATE SET '
+                'word = excluded.word, score = excluded.score '
+                'WHERE excluded.score > best.score',
+                [play[:3] for play in self._pending])
+        self._pending = []
+
+    def best(self, user):
+        self.flush()
+        row = self.db.execute('SELECT word, score FROM best WHERE user = ?',
+                              (user,)).fetchone()
+        word, score = row if row else (None, 0)
+        return {'word': word, 'score': score}
+
+    def leaderboard(self, n=10):
+        self.flush()
+        return self.db.execute(
+            'SELECT user, word, score FROM best '
+            'ORDER BY score DESC LIMIT ?', (n,)).fetchall()
+
+    def history(self, user, n=10):
+        self.flush()
+        return self.db.execute(
+            'SELECT word, score, played_at FROM plays WHERE user = ? '
+            'ORDER BY played_at DESC, rowid DESC LIMIT ?',
+            (user, n)).fetchall()
+
+    def close(self):
+        self.flush()
+        self.db.close()
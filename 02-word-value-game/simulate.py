@@ -0,0 +1,139 @@
+#! /usr/bin/python3
+# Headless word game: play many seeded games across a process pool and
+# aggregate the results, to evaluate pouch distributions and scoring rules.
+import argparse
+import multiprocessing
+import random
+from collections import Counter
+
+from game import (NUM_LETTERS, calculate_score, draw_letters, find_best_move,
+                  has_vowels, take_tiles, word_graph)
+from pouch import Pouch
+
+ROUNDS = 10
+GAMES_PER_TASK = 50
+
+
+def optimal_player(rng, letters):
+    return find_best_move(letters)[0]
+
+
+def random_player(rng, letters):
+    words = list(word_graph().words(letters))
+    return rng.choice(words) if words else None
+
+
+PLAYERS = {'optimal': optimal_player, 'random': random_player}
+
+
+class Stats:
+    """Aggregate results of simulated rounds, add two together to merge"""
+
+    def __init__(self):
+        self.games = 0
+        self.rounds = 0
+        self.stuck = 0  # games ended early, no word could be made
+        self.draws = 0
+        self.vowel_retries = 0
+        self.scores = Counter()
+        self.best_scores = Counter()
+        self.grades = Counter()  # grade rounded down to 0.1
+
+    def __add__(self, other):
+        total = Stats()
+        for name, value in vars(self).items():
+            setattr(total, name, value + getattr(other, name))
+        return total
+
+    @property
+    def vowel_retry_rate(self):
+        return self.vowel_retries / self.draws if self.draws else 0
+
+    @property
+    def mean_score(self):
+        if not self.rounds:
+            return 0
+        return sum(score * n for score, n in self.scores.items()) / self.rounds
+
+    def report(self):
+        return '\n'.join([
+            f'games: {self.games}, rounds: {self.rounds}, '
+            f'stuck: {self.stuck}',
+            f'mean score: {self.mean_score:.2f}',
+            f'vowel retries: {self.vowel_retries} of {self.draws} draws '
+            f'({self.vowel_retry_rate:.2%})',
+            'grades: ' + ', '.join(f'{grade:.1f}: {n}' for grade, n
+                                   in sorted(self.grades.items())),
+        ])
+
+
+def play_game(rng, player, rounds, stats):
+    letters = []
+    draw_amt = NUM_LETTERS
+    pouch = Pouch(rng=rng)
+    for _ in range(rounds):
+        letters.extend(draw_letters(draw_amt, not has_vowels(letters), pouch))
+        best_word, best_word_val = find_best_move(letters)
+        word = player(rng, letters)
+        if best_word is None or word is None:
+            stats.stuck += 1
+            break
+        tiles = take_tiles(letters, word)
+        score = calculate_score(''.join(tiles), best_word_val, verbose=False)
+        stats.rounds += 1
+        stats.scores[score] += 1
+        stats.best_scores[best_word_val] += 1
+        if best_word_val:
+            stats.grades[int(score / best_word_val * 10) / 10] += 1
+        draw_amt = len(word)
+    stats.games += 1
+    stats.draws += pouch.draws
+    stats.vowel_retries += pouch.vowel_retries
+
+
+def run_task(task):
+    """Play one batch of games, the seed makes every batch reproducible"""
+    seed, games, rounds, player = task
+    rng = random.Random(seed)
+    stats = Stats()
+    for _ in range(games):
+        play_game(rng, PLAYERS[player], rounds, stats)
+    return stats
+
+
+def simulate(games, rounds=ROUNDS, seed=0, player='optimal', processes=None):
+    """Yield running totals (Stats) as batches of games finish"""
+    tasks = []
+    for i, start in enumerate(range(0, games, GAMES_PER_TASK)):
+        size = min(GAMES_PER_TASK, games - start)
+        tasks.append((f'{seed}-{i}', size, rounds, player))
+
+    # build the word graph before forking so the workers share it
+    word_graph()
+    total = Stats()
+    ctx = multiprocessing.get_context('fork')
+    with ctx.Pool(processes) as pool:
+        for stats in pool.imap_unordered(run_task, tasks):
+            total += stats
+            yield total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate word games')
+    parser.add_argument('-g', '--games', type=int, default=1000)
+    parser.add_argument('-r', '--rounds', type=int, default=ROUNDS)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-p', '--processes', type=int, default=None)
+    parser.add_argument('--player', choices=PLAYERS, default='optimal')
+    args = parser.parse_args()
+
+    stats = Stats()
+    for stats in simulate(args.games, args.rounds, args.seed, args.player,
+                          args.processes):
+        print(f'\r{stats.games}/{args.games} games', end='', flush=True)
+    print()
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
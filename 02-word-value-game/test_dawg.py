@@ -0,0 +1,57 @@
+import unittest
+
+from dawg import BLANK, Dawg
+from data import LETTER_SCORES
+
+WORDS = sorted(['bob', 'cat', 'cats', 'act', 'acts', 'quit', 'quits',
+                'zebra', 'a', 'at'])
+
+
+class TestDawg(unittest.TestCase):
+    def setUp(self):
+        self.dawg = Dawg(WORDS)
+
+    def test_contains(self):
+        for word in WORDS:
+            self.assertIn(word, self.dawg)
+        for word in ('', 'ca', 'catss', 'zebras', 'b'):
+            self.assertNotIn(word, self.dawg)
+
+    def test_shares_suffixes(self):
+        trie_nodes = len({word[:i] for word in WORDS
+                          for i in range(len(word) + 1)})
+        self.assertLess(self.dawg.nodes, trie_nodes)
+
+    def test_unsorted_words(self):
+        self.assertRaises(ValueError, Dawg, ['cat', 'act'])
+
+    def test_words(self):
+        self.assertEqual(sorted(self.dawg.words(list('TACS'))),
+                         ['a', 'act', 'acts', 'at', 'cat', 'cats'])
+        self.assertEqual(sorted(self.dawg.words(['B', BLANK, BLANK])),
+                         ['a', 'at', 'bob'])
+
+    def test_best_word(self):
+        word, value = self.dawg.best_word(list('STAC'), LETTER_SCORES)
+        self.assertIn(word, ('acts', 'cats'))
+        self.assertEqual(value, 6)
+        self.assertEqual(self.dawg.best_word(list('QUITSX'), LETTER_SCORES),
+                         ('quits', 14))
+        self.assertEqual(self.dawg.best_word(list('XX'), LETTER_SCORES),
+                         (None, 0))
+
+    def test_blanks(self):
+        # blanks score nothing, so the real tiles decide
+        self.assertEqual(
+            self.dawg.best_word(['Z', 'E', 'B', BLANK, BLANK], LETTER_SCORES),
+            ('zebra', 14))
+        self.assertEqual(
+            self.dawg.best_word(['Q', BLANK, 'I', 'T'], LETTER_SCORES),
+            ('quit', 12))
+        word, value = self.dawg.best_word([BLANK, BLANK], LETTER_SCORES)
+        self.assertIn(word, ('a', 'at'))
+        self.assertEqual(value, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from dictbin import CompiledDictionary, compile_words
+
+WORDS = ['quit', 'a', 'Bob', 'barbeque', 'bob', 'Jean-Pierre', 'zyzzyva']
+
+
+class TestCompiledDictionary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'words.bin')
+        compile_words(WORDS, self.path, len)
+        self.words = CompiledDictionary(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookups(self):
+        for i, word in enumerate(WORDS):
+            self.assertIn(word, self.words)
+            self.assertEqual(self.words.index(word), i)
+            self.assertEqual(self.words.score(i), len(word))
+        for word in ('', 'qui', 'quits', 'BOB', 'pybites'):
+            self.assertNotIn(word, self.words)
+        with self.assertRaises(ValueError):
+            self.words.index('pybites')
+
+    def test_words(self):
+        self.assertEqual(len(self.words), len(WORDS))
+        self.assertEqual(self.words.words(), WORDS)
+        self.assertEqual(list(self.words), WORDS)
+        self.assertEqual(self.words[-1], 'zyzzyva')
+
+    def test_empty(self):
+        compile_words([], self.path, len)
+        words = CompiledDictionary(self.path)
+        self.assertEqual(len(words), 0)
+        self.assertNotIn('a', words)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
-import itertools
+import random
 import unittest
+from collections import Counter
+
+from dawg import BLANK
 from game import draw_letters, calc_word_value, max_word_value
-from game import isValid
-# from game import get_possible_dict_words, _get_permutations_draw
-# from game import _validation
+from game import find_best_move, find_optimal_word, is_valid, take_tiles
+from game import word_graph, VOWELS
+from pouch import Pouch
 
 NUM_LETTERS = 7
 TEST_WORDS = ('bob', 'julian', 'pybites', 'quit', 'barbeque')
@@ -16,6 +19,16 @@ class TestGame(unittest.TestCase):
     def test_draw_letters(self):
         letter_str = ''.join(self.draw)
         self.assertRegex(letter_str, r'^[A-Z]{%s}$' % NUM_LETTERS)
+        self.assertTrue(set(self.draw) & VOWELS)
+
+    def test_draw_letters_from_pouch(self):
+        pouch = Pouch(rng=random.Random(8))
+        drawn = []
+        while len(pouch):
+            drawn.extend(draw_letters(pouch=pouch))
+        # every tile comes out once, the last draw gets what's left
+        self.assertEqual(Counter(drawn), Counter(Pouch().counts))
+        self.assertEqual(draw_letters(pouch=pouch), [])
 
     # from ch01
     def test_calc_word_value(self):
@@ -26,31 +39,50 @@ class TestGame(unittest.TestCase):
     def test_max_word_value(self):
         self.assertEqual(max_word_value(TEST_WORDS), 'barbeque')
 
-    def test_get_permutations_draw(self):
-        gen_permutations_n_letters = sum(
-            len(list(itertools.permutations(self.draw, n)))
-            for n in range(1, NUM_LETTERS + 1))
-        game_permutations = len(list(_get_permutations_draw(self.draw)))
-        self.assertEqual(gen_permutations_n_letters, game_permutations)
-        alist = range(1, 8)
-        gen_permutations_any_list = sum(
-            len(list(itertools.permutations(alist, n)))
-            for n in range(1, NUM_LETTERS + 1))
-        self.assertEqual(gen_permutations_any_list, gen_permutations_n_letters)
-
-    def test_get_possible_dict_words(self):
-        self.fixed_draw = list('garytev'.upper())
-        words = get_possible_dict_words(self.fixed_draw)
+    def test_possible_dict_words(self):
+        words = set(word_graph().words(list('garytev'.upper())))
         self.assertEqual(len(words), 137)
 
+    def test_find_optimal_word(self):
+        self.assertEqual(find_optimal_word(list('GARYTEV')), 'garvey')
+        self.assertEqual(find_best_move(list('GARYTEV')), ('garvey', 13))
+        self.assertEqual(find_best_move(list('BARBEQUE')), ('qubba', 18))
+        self.assertEqual(find_best_move([]), (None, 0))
+
+    def test_find_optimal_word_all_tiles(self):
+        # words using every tile on the rack count too
+        self.assertEqual(find_optimal_word(list('QUIT')), 'quit')
+        self.assertEqual(find_best_move(list('ZAJZ')), ('jazz', 29))
+
+    def test_find_optimal_word_blank(self):
+        # the blank is the B of quib and scores nothing
+        self.assertEqual(find_best_move(list('QUI') + [BLANK]), ('quib', 12))
+
+    def test_take_tiles(self):
+        letters = list('GARYTEV')
+        self.assertEqual(take_tiles(letters, 'gave'), list('GAVE'))
+        self.assertEqual(letters, list('RYT'))
+
+    def test_take_tiles_blank(self):
+        letters = list('QUI') + [BLANK]
+        self.assertEqual(take_tiles(letters, 'quit'), list('QUI') + [BLANK])
+        self.assertEqual(letters, [])
+
+    def test_take_tiles_missing(self):
+        self.assertRaises(ValueError, take_tiles, list('QUI'), 'quit')
+        # only one blank to stand in for a letter
+        self.assertRaises(ValueError, take_tiles,
+                          list('QU') + [BLANK], 'quit')
+
     def test_validation(self):
         draw = list('garytev'.upper())
-        word = 'GARYTEV'
-        self.assertRaises(ValueError, isValid, word, draw)
-        word = 'F'
-        self.assertRaises(ValueError, isValid, word, draw)
-        word = 'GARETTA'
-        self.assertRaises(ValueError, isValid, word, draw)
+        self.assertTrue(is_valid(draw, 'gravy'))
+        self.assertEqual(draw, list('GARYTEV'))  # the rack is left alone
+        self.assertFalse(is_valid(draw, 'GARYTEV'))  # not a word
+        self.assertFalse(is_valid(draw, 'F'))
+        self.assertFalse(is_valid(draw, 'GARETTA'))  # only one T
+        self.assertFalse(is_valid(draw, 'quit'))  # not on the rack
+        self.assertTrue(is_valid(list('QUI') + [BLANK], 'quit'))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+import random
+import unittest
+from collections import Counter
+
+from data import POUCH
+from pouch import Pouch, VOWELS
+
+
+class TestPouch(unittest.TestCase):
+    def setUp(self):
+        self.pouch = Pouch(rng=random.Random(2))
+
+    def test_draws_without_replacement(self):
+        drawn = []
+        while len(self.pouch):
+            drawn.extend(self.pouch.draw(7))
+        self.assertEqual(Counter(drawn), Counter(POUCH))
+        self.assertEqual(self.pouch.draw(7), [])
+        self.assertFalse(+self.pouch.counts)
+
+    def test_put_back(self):
+        tiles = self.pouch.draw(5)
+        self.assertEqual(len(self.pouch), len(POUCH) - 5)
+        self.pouch.put_back(tiles)
+        self.assertEqual(self.pouch.counts, Counter(POUCH))
+
+    def test_vowel_guarantee(self):
+        for _ in range(10):
+            self.assertTrue(set(self.pouch.draw(2, need_vowel=True)) & VOWELS)
+
+    def test_vowel_retries_are_bounded(self):
+        pouch = Pouch(list('BCDFGA'), rng=random.Random(0))
+        letters = pouch.draw(1, need_vowel=True, retries=3)
+        self.assertLessEqual(pouch.vowel_retries, 3)
+        self.assertEqual(len(letters), 1)
+        # no vowels left at all: don't bother retrying
+        pouch = Pouch(list('BCDFG'))
+        pouch.draw(3, need_vowel=True)
+        self.assertEqual(pouch.vowel_retries, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
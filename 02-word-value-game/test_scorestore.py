@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from scorestore import ShelveScoreStore, SQLiteScoreStore
+
+
+def _play_many(path, user, plays):
+    with SQLiteScoreStore(path, batch_size=7) as store:
+        for score in range(plays):
+            store.record(user, f'word{score}', score)
+
+
+class TestScoreStores(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stores = [
+            SQLiteScoreStore(os.path.join(self.tmp.name, 'scores.db')),
+            ShelveScoreStore(os.path.join(self.tmp.name, 'app')),
+        ]
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.tmp.cleanup()
+
+    def test_best_and_leaderboard(self):
+        for store in self.stores:
+            self.assertEqual(store.best('bob'), {'word': None, 'score': 0})
+            store.record('bob', 'quiz', 22)
+            store.record('bob', 'cat', 5)
+            store.record('julian', 'barbeque', 21)
+            self.assertEqual(store.best('bob'), {'word': 'quiz', 'score': 22})
+            self.assertEqual(store.leaderboard(), [('bob', 'quiz', 22),
+                                                   ('julian', 'barbeque', 21)])
+            self.assertEqual(store.leaderboard(1), [('bob', 'quiz', 22)])
+
+    def test_history(self):
+        store = self.stores[0]
+        store.record('bob', 'quiz', 22)
+        store.record('bob', 'cat', 5)
+        self.assertEqual([play[:2] for play in store.history('bob')],
+                         [('cat', 5), ('quiz', 22)])
+        self.assertEqual(store.history('julian'), [])
+
+    def test_concurrent_writers(self):
+        path = os.path.join(self.tmp.name, 'shared.db')
+        SQLiteScoreStore(path).close()
+        procs = [multiprocessing.Process(target=_play_many,
+                                         args=(path, f'user{i}', 50))
+                 for i in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        with SQLiteScoreStore(path) as store:
+            self.assertEqual(len(store.leaderboard(10)), 4)
+            self.assertEqual(len(store.history('user2', 100)), 50)
+            self.assertEqual(store.best('user3')['score'], 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from simulate import Stats, run_task, simulate
+
+
+class TestSimulate(unittest.TestCase):
+    def test_run_task_is_reproducible(self):
+        task = ('test', 3, 4, 'random')
+        first, second = run_task(task), run_task(task)
+        self.assertEqual(vars(first), vars(second))
+        self.assertEqual(first.games, 3)
+        # a game stuck after k rounds adds k + 1, not all 4
+        self.assertLessEqual(first.rounds + first.stuck, 12)
+        self.assertLessEqual(first.stuck, first.games)
+        self.assertGreaterEqual(first.draws, first.rounds)
+
+    def test_stuck_games_end_early(self):
+        # 40 rounds runs the pouch dry, this seed gets stuck once
+        stats = run_task(('stuck', 3, 40, 'random'))
+        self.assertEqual(stats.games, 3)
+        self.assertEqual(stats.stuck, 1)
+        self.assertLess(stats.rounds + stats.stuck, 3 * 40)
+        self.assertEqual(sum(stats.scores.values()), stats.rounds)
+
+    def test_stats_merge(self):
+        a, b = run_task(('a', 2, 2, 'optimal')), run_task(('b', 2, 2, 'random'))
+        total = a + b
+        self.assertEqual(total.games, 4)
+        self.assertEqual(total.scores, a.scores + b.scores)
+        self.assertEqual(total.vowel_retries,
+                         a.vowel_retries + b.vowel_retries)
+
+    def test_simulate_streams_totals(self):
+        totals = list(simulate(60, rounds=2, seed=1, processes=2))
+        self.assertEqual(len(totals), 2)
+        self.assertEqual(totals[-1].games, 60)
+        self.assertIsInstance(totals[-1], Stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Count tags over many RSS/Atom feeds in parallel.
+
+Every worker process counts a batch of feeds and sums them into one
+partial Counter, the main process only adds up those partials. The
+per-feed Counters come back too, for breakdowns.
+"""
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from tags import TOP_NUMBER, get_tags, get_top_tags
+
+FEED_EXTENSIONS = ('.xml', '.rss', '.atom', '.gz')
+FEEDS_PER_TASK = 16
+
+
+def feed_paths(*paths):
+    """Expand directories into the feed files inside them"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(FEED_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def merge_counts(counts):
+    """Sum Counters into one, updating it in place"""
+    total = Counter()
+    for count in counts:
+        total.update(count)
+    return total
+
+
+def _count_feeds(feeds):
+    counted = [(feed, get_tags(feed)) for feed in feeds]
+    return counted, merge_counts(count for _, count in counted)
+
+
+def aggregate_feeds(feeds, processes=None):
+    """Count tags in every feed using a process pool.
+    Return (combined Counter, {feed: Counter})."""
+    feeds = list(feeds)
+    batches = [feeds[i:i + FEEDS_PER_TASK]
+               for i in range(0, len(feeds), FEEDS_PER_TASK)]
+    per_feed = {}
+    partials = []
+    with ProcessPoolExecutor(processes) as pool:
+        for counted, partial in pool.map(_count_feeds, batches):
+            per_feed.update(counted)
+            partials.append(partial)
+    return merge_counts(partials), per_feed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('usage: aggregate.py FEED_OR_DIR [...]')
+        sys.exit(1)
+    tags, per_feed = aggregate_feeds(feed_paths(*sys.argv[1:]))
+    print('* Top {} tags over {} feeds:'.format(TOP_NUMBER, len(per_feed)))
+    for tag, count in get_top_tags(tags):
+        print('{:<20} {}'.format(tag, count))
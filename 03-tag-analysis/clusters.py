@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Group similar tags into clusters instead of pairs.
+
+Every similar pair from tags.similar_pairs joins two groups, so chains
+like 'test' ~ 'tests' ~ 'testing' end up in one cluster even though
+the ends aren't similar themselves. The most common tag of a cluster is
+its canonical name; the {tag: canonical} map can be saved and passed to
+get_tags to merge the tags while counting.
+"""
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+from tags import RSS_FEED, SIMILAR, get_tags, similar_pairs
+
+CANONICAL_FILE = 'canonical.json'
+
+
+class UnionFind:
+    """Disjoint sets of the numbers 0 .. size - 1, union by size with
+    path halving, so a long run of unions and finds is near linear"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return i
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+        return i
+
+
+def tag_clusters(tags, cutoff=SIMILAR):
+    """Lists of two or more similar tags, each ordered most common tag
+    first (then alphabetically), biggest merged count first"""
+    words = sorted(tags)
+    ids = {word: i for i, word in enumerate(words)}
+    groups = UnionFind(len(words))
+    for word, other, _ in similar_pairs(words, cutoff):
+        groups.union(ids[word], ids[other])
+
+    members = defaultdict(list)
+    for i, word in enumerate(words):
+        members[groups.find(i)].append(word)
+    clusters = [sorted(cluster, key=lambda tag: (-tags[tag], tag))
+                for cluster in members.values() if len(cluster) > 1]
+    clusters.sort(key=lambda cluster: (-sum(tags[t] for t in cluster),
+                                       cluster[0]))
+    return clusters
+
+
+def canonical_map(clusters):
+    """{tag: canonical tag} for every tag that isn't its own canonical"""
+    return {tag: cluster[0] for cluster in clusters for tag in cluster[1:]}
+
+
+def canonicalize(tags, canonical):
+    """Counter with the counts of tags merged into their canonical tag"""
+    merged = Counter()
+    for tag, count in tags.items():
+        merged[canonical.get(tag, tag)] += count
+    return merged
+
+
+def save_canonical(canonical, path=CANONICAL_FILE):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(canonical, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_canonical(path=CANONICAL_FILE):
+    """The saved map, or an empty one if there is none yet"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    tags = get_tags(sys.argv[1] if len(sys.argv) > 1 else RSS_FEED)
+    clusters = tag_clusters(tags)
+    save_canonical(canonical_map(clusters))
+    print('* Tag clusters:')
+    for cluster in clusters:
+        print('{:<20} {}'.format(cluster[0], ', '.join(cluster[1:])))
+    print('saved to {}'.format(CANONICAL_FILE))
@@ -1,24 +1,95 @@
 #!/usr/bin/python3
 import xml.etree.ElementTree as ET
-from collections import Counter
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from pprint import pprint
+import bisect
 import difflib
+import gzip
+import math
+
+from topk import SpaceSaving
 
 TOP_NUMBER = 10
 RSS_FEED = 'rss.xml'
 SIMILAR = 0.87
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _head(f, size=2):
+    """Peek at the first bytes of f without consuming them"""
+    if hasattr(f, 'peek'):
+        return f.peek(size)[:size]
+    if f.seekable():
+        pos = f.tell()
+        head = f.read(size)
+        f.seek(pos)
+        return head
+    return b''
+
+
+@contextmanager
+def open_feed(feed):
+    """Open feed, a path or a file object, for parsing.
+    Gzipped feeds are decompressed on the fly."""
+    f = feed if hasattr(feed, 'read') else open(feed, 'rb')
+    try:
+        if _head(f) == GZIP_MAGIC:
+            with gzip.open(f) as unzipped:
+                yield unzipped
+        else:
+            yield f
+    finally:
+        if f is not feed:
+            f.close()
+
+
+def _local(tag):
+    """Tag name without its namespace, Atom elements have one"""
+    return tag.rpartition('}')[2]
+
 
+def iter_items(feed=RSS_FEED):
+    """Stream feed and yield each RSS 'item' or Atom 'entry' Element once
+    it's complete. Items are dropped from the tree after use, so memory
+    use stays flat whatever the size of the feed."""
+    with open_feed(feed) as f:
+        parents = []
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                continue
+            parents.pop()
+            if _local(elem.tag) in ('item', 'entry'):
+                yield elem
+                if parents:
+                    parents[-1].remove(elem)
 
-def get_tags():
-    """Find all tags in RSS_FEED.
-    Replace dash with whitespace."""
-    tree = ET.parse(RSS_FEED)
 
-    tags = Counter()
-    # Iterate over all 'item' Elements and get text of 'category' children.
-    for item in tree.getroot().iter('item'):
-        for category in item.findall('category'):
-            tags[category.text.lower().replace('-', ' ')] += 1
+def item_tags(item):
+    """Tags of an item: text of RSS 'category' children or the term of
+    Atom ones. Lowercase with dashes replaced by whitespace."""
+    for child in item:
+        if _local(child.tag) == 'category':
+            tag = child.get('term') or child.text
+            if tag:
+                yield tag.lower().replace('-', ' ')
+
+
+def get_tags(feed=RSS_FEED, capacity=None, canonical=None):
+    """Find all tags in feed (RSS_FEED by default).
+    Replace dash with whitespace.
+    Counts are exact, unless capacity is given: then only (about) the
+    capacity most common tags are kept, see topk.SpaceSaving.
+    canonical ({tag: canonical tag}, see clusters.py) counts tags under
+    their canonical name."""
+    tags = Counter() if capacity is None else SpaceSaving(capacity)
+    # Iterate over all items and count their tags
+    for item in iter_items(feed):
+        if canonical:
+            tags.update(canonical.get(tag, tag) for tag in item_tags(item))
+        else:
+            tags.update(item_tags(item))
     # pprint(tags)
     return tags
 
@@ -28,21 +99,177 @@ def get_top_tags(tags):
     return tags.most_common(TOP_NUMBER)
 
 
+def _tokens(items):
+    """Items numbered by occurrence: 'aab' -> a0 a1 b0, so two sequences
+    share as many tokens as they have items in common"""
+    seen = Counter()
+    tokens = []
+    for item in items:
+        tokens.append((item, seen[item]))
+        seen[item] += 1
+    return tokens
+
+
+def _bigrams(word):
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def _min_matches(length, cutoff):
+    """Fewest matching letters for difflib's ratio 2 * M / length to
+    reach cutoff"""
+    matches = max(0, math.ceil(cutoff * length / 2) - 1)
+    while 2.0 * matches / length < cutoff:
+        matches += 1
+    return matches
+
+
+class _TokenIndex:
+    """Each word's tokens, rarest first, and per (token, word length) the
+    ascending ids of the words that have it. Words can be added later."""
+
+    def __init__(self, words, tokenize):
+        self.tokenize = tokenize
+        self.tokens = []
+        self.counts = Counter()
+        self.postings = defaultdict(list)
+        self.extend(words)
+
+    def extend(self, words):
+        """Index words, numbering them on from the ones indexed before"""
+        start = len(self.tokens)
+        tokens = [_tokens(self.tokenize(word)) for word in words]
+        self.counts.update(token for word in tokens for token in word)
+        for i, (word, word_tokens) in enumerate(zip(words, tokens), start):
+            word_tokens.sort(key=lambda t: (self.counts[t], t))
+            self.tokens.append(word_tokens)
+            for token in word_tokens:
+                self.postings[token, len(word)].append(i)
+
+    def candidates(self, i, size, need, after=True):
+        """Ids of words of length size (only those after i if after) that
+        can share need of word i's tokens. If they do they must share at
+        least `least` of its first len - need + least (rarest) tokens."""
+        tokens = self.tokens[i]
+        least = min(3, need)
+        shared = Counter()
+        for token in tokens[:len(tokens) - need + least]:
+            posting = self.postings[token, size]
+            start = bisect.bisect_right(posting, i) if after else 0
+            shared.update(posting[start:])
+        return [j for j, n in shared.items() if n >= least and j != i]
+
+
+class SimilarityIndex:
+    """Letter and bigram indexes over a growing set of words, to find
+    the similar pairs among them (see similar_pairs)
+
+    Only plausible pairs get scored. For lengths a and b, ratio >= cutoff
+    takes M = _min_matches(a + b) matching letters, in at most
+    a + b - 2M + 1 blocks (consecutive blocks are split by a gap in
+    either word). So the words share at least M letters and at least
+    3M - a - b - 1 bigrams, and inverted indexes on letter and bigram
+    tokens find the words that do without looking at every pair."""
+
+    def __init__(self, words=()):
+        self.words = []
+        self.letters = _TokenIndex([], list)
+        self.bigrams = _TokenIndex([], _bigrams)
+        self.letter_sets = []
+        self.by_length = defaultdict(list)
+        self.add(words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, words):
+        """Index words not indexed before"""
+        words = list(words)
+        start = len(self.words)
+        self.words.extend(words)
+        self.letters.extend(words)
+        self.bigrams.extend(words)
+        self.letter_sets.extend(frozenset(tokens)
+                                for tokens in self.letters.tokens[start:])
+        for i, word in enumerate(words, start):
+            self.by_length[len(word)].append(i)
+
+    def pairs(self, cutoff=SIMILAR, only=None):
+        """Yield (word, other, ratio) for every pair of indexed words,
+        word < other, with a difflib ratio >= cutoff. If only (a set of
+        indexed words) is given, just the pairs with one of those in
+        them."""
+        words = self.words
+        if only is None:
+            outer, after = range(len(words)), True
+        else:
+            outer = [i for i, word in enumerate(words) if word in only]
+            after = False
+
+        matcher = difflib.SequenceMatcher()
+        for i in outer:
+            word = words[i]
+            size = len(word)
+            candidates = set()
+            for other, ids in self.by_length.items():
+                total = size + other
+                # same bound as real_quick_ratio
+                if not total or 2.0 * min(size, other) / total < cutoff:
+                    continue
+                need = _min_matches(total, cutoff)
+                shared_bigrams = 3 * need - total - 1
+                if shared_bigrams > 0:
+                    candidates.update(self.bigrams.candidates(
+                        i, other, shared_bigrams, after))
+                elif need > 0:
+                    candidates.update(
+                        self.letters.candidates(i, other, need, after))
+                else:
+                    candidates.update(
+                        ids[bisect.bisect_right(ids, i):] if after else ids)
+            if not after:
+                # pairs of two `only` words are done once, from the first
+                candidates = {j for j in candidates if j != i and not (
+                    words[j] < word and words[j] in only)}
+
+            # the shared letters are what quick_ratio counts, then do the
+            # full ratio in the same argument order as
+            # difflib.get_close_matches
+            matcher.set_seq2(word)
+            for j in sorted(candidates):
+                common = len(self.letter_sets[i] & self.letter_sets[j])
+                if 2.0 * common / (size + len(words[j])) < cutoff:
+                    continue
+                if words[j] > word:
+                    matcher.set_seq1(words[j])
+                    ratio = matcher.ratio()
+                    pair = word, words[j]
+                else:
+                    ratio = difflib.SequenceMatcher(
+                        None, word, words[j]).ratio()
+                    pair = words[j], word
+                if ratio >= cutoff:
+                    yield pair + (ratio,)
+
+
+def similar_pairs(words, cutoff=SIMILAR, only=None):
+    """Yield (word, other, ratio) for every pair of (sorted, unique)
+    words, other after word in words, with a difflib ratio >= cutoff.
+    If only (a set of words) is given, just the pairs with at least one
+    of those in them. See SimilarityIndex."""
+    return SimilarityIndex(words).pairs(cutoff, only)
+
+
 def get_similarities(tags):
     """Find set of tags pairs with similarity ratio of > SIMILAR"""
     # Get list of tags
     words = sorted(list(tags.keys()))
 
-    similarities = dict()
-    # Compare each word to every word after it
-    for i, word in enumerate(words):
-        possibilities = words[i + 1:]
-        matches = difflib.get_close_matches(word,
-                                            possibilities,
-                                            cutoff=SIMILAR)
-        # print('word: {}, matches: {}'.format(word, matches))
-        if matches:
-            similarities[word] = matches[0]
+    # Compare each word to the plausible words after it, keep the best
+    # match, same as difflib.get_close_matches(...)[0] would
+    best = dict()
+    for word, other, ratio in similar_pairs(words, SIMILAR):
+        best[word] = max(best.get(word, (ratio, other)), (ratio, other))
+    similarities = {word: other for word, (_, other) in best.items()}
 
     # pprint(similarities)
     return similarities
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""Incremental tag counting: remember which items were counted already
+so re-reading a refreshed feed only costs the new items.
+
+The state file is gzipped JSON: tag counts, the current top tags and
+similar tags, and an 8 byte digest per counted item.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from heapq import nsmallest
+
+from tags import (RSS_FEED, SIMILAR, TOP_NUMBER, SimilarityIndex, item_tags,
+                  iter_items)
+
+STATE_FILE = 'tags.state.json.gz'
+DIGEST_SIZE = 8
+
+
+def item_key(item):
+    """Digest identifying an item: its guid, else its link, else its
+    whole content"""
+    for name in ('guid', 'link', '{http://www.w3.org/2005/Atom}id'):
+        text = item.findtext(name)
+        if text:
+            break
+    else:
+        text = ''.join(item.itertext())
+    return hashlib.blake2b(text.strip().encode(),
+                           digest_size=DIGEST_SIZE).digest()
+
+
+class TagState:
+    """Tag counts plus the top tags and similar tags derived from them,
+    kept up to date as new items come in"""
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.seen = set()
+        self.tags = Counter()
+        self.top = []
+        self._best = {}  # word -> (ratio, most similar later word)
+        self._index = None  # SimilarityIndex of the tags, built on demand
+        if os.path.exists(path):
+            self._load()
+
+    @property
+    def similarities(self):
+        """Same as tags.get_similarities(self.tags)"""
+        return {word: other for word, (_, other) in self._best.items()}
+
+    def update(self, feed=RSS_FEED):
+        """Count the items in feed that weren't counted before, return
+        how many that were"""
+        changed = Counter()
+        new_items = 0
+        for item in iter_items(feed):
+            key = item_key(item)
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            new_items += 1
+            changed.update(item_tags(item))
+        if changed:
+            new_tags = set(changed) - set(self.tags)
+            self.tags.update(changed)
+            self._update_top(changed)
+            self._update_similarities(new_tags)
+        return new_items
+
+    def _update_top(self, changed):
+        # counts only go up, so the new top is among the old top and
+        # the tags that just changed
+        candidates = {tag for tag, _ in self.top} | set(changed)
+        self.top = [(tag, self.tags[tag]) for tag in nsmallest(
+            TOP_NUMBER, candidates, key=lambda tag: (-self.tags[tag], tag))]
+
+    def _update_similarities(self, new_tags):
+        # a new tag can only add pairs it is part of: index just the new
+        # tags and look for those pairs, the older tags stay indexed
+        if self._index is None:
+            self._index = SimilarityIndex(sorted(self.tags))
+        else:
+            self._index.add(sorted(new_tags))
+        for word, other, ratio in self._index.pairs(SIMILAR, new_tags):
+            self._best[word] = max(self._best.get(word, (ratio, other)),
+                                   (ratio, other))
+
+    def _load(self):
+        with gzip.open(self.path, 'rt') as f:
+            state = json.load(f)
+        seen = base64.b64decode(state['seen'])
+        self.seen = {seen[i:i + DIGEST_SIZE]
+                     for i in range(0, len(seen), DIGEST_SIZE)}
+        self.tags = Counter(state['tags'])
+        self.top = [tuple(entry) for entry in state['top']]
+        self._best = {word: tuple(best)
+                      for word, best in state['similar'].items()}
+
+    def save(self):
+        state = {
+            'seen': base64.b64encode(b''.join(sorted(self.seen))).decode(),
+            'tags': self.tags,
+            'top': self.top,
+            'similar': self._best,
+        }
+        # write next to the state file and rename, never leave half a file
+        tmp = f'{self.path}.tmp'
+        with gzip.open(tmp, 'wt') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+
+if __name__ == "__main__":
+    state = TagState()
+    for feed in sys.argv[1:] or [RSS_FEED]:
+        print('{}: {} new items'.format(feed, state.update(feed)))
+    state.save()
+    print('* Top {} tags:'.format(TOP_NUMBER))
+    for tag, count in state.top:
+        print('{:<20} {}'.format(tag, count))
@@ -0,0 +1,55 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from aggregate import aggregate_feeds, feed_paths, merge_counts
+from tags import get_tags, RSS_FEED
+
+ATOM_FEED = b'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom</title>
+  <entry><title>one</title><category term="Python"/>
+    <category term="code-challenges"/></entry>
+  <entry><title>two</title><category term="python"/></entry>
+</feed>'''
+
+
+class TestAggregate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        shutil.copy(RSS_FEED, os.path.join(self.tmp, 'a.xml'))
+        with gzip.open(os.path.join(self.tmp, 'b.xml.gz'), 'wb') as f:
+            with open(RSS_FEED, 'rb') as rss:
+                f.write(rss.read())
+        with open(os.path.join(self.tmp, 'c.atom'), 'wb') as f:
+            f.write(ATOM_FEED)
+        with open(os.path.join(self.tmp, 'notes.txt'), 'w') as f:
+            f.write('not a feed')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_atom_feed(self):
+        tags = get_tags(os.path.join(self.tmp, 'c.atom'))
+        self.assertEqual(tags, Counter({'python': 2, 'code challenges': 1}))
+
+    def test_merge_counts(self):
+        counts = [Counter({'a': i, 'b': 1}) for i in range(1, 6)]
+        self.assertEqual(merge_counts(counts), Counter({'a': 15, 'b': 5}))
+        self.assertEqual(merge_counts([]), Counter())
+
+    def test_aggregate_feeds(self):
+        feeds = list(feed_paths(self.tmp))
+        self.assertEqual(len(feeds), 3)
+        tags, per_feed = aggregate_feeds(feeds, processes=2)
+        rss = get_tags()
+        self.assertEqual(per_feed[os.path.join(self.tmp, 'a.xml')], rss)
+        self.assertEqual(tags['python'], 2 * rss['python'] + 2)
+        self.assertEqual(tags, merge_counts(per_feed.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
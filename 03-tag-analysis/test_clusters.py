@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from clusters import UnionFind, canonical_map, canonicalize, tag_clusters
+from clusters import load_canonical, save_canonical
+from tags import get_similarities, get_tags
+
+
+class TestClusters(unittest.TestCase):
+    def setUp(self):
+        self.tags = get_tags()
+
+    def test_union_find(self):
+        groups = UnionFind(6)
+        groups.union(0, 1)
+        groups.union(2, 3)
+        groups.union(1, 3)
+        self.assertEqual(len({groups.find(i) for i in range(4)}), 1)
+        self.assertNotEqual(groups.find(4), groups.find(5))
+        self.assertEqual(groups.size[groups.find(0)], 4)
+
+    def test_chain(self):
+        tags = Counter({'test': 3, 'tests': 5, 'testing': 1, 'pytest': 2,
+                        'flask': 4})
+        # 'testing' is similar to 'test', not to 'tests'
+        clusters = tag_clusters(tags, cutoff=0.7)
+        self.assertEqual(clusters, [['tests', 'test', 'pytest', 'testing']])
+        canonical = canonical_map(clusters)
+        self.assertEqual(canonical['testing'], 'tests')
+        self.assertNotIn('tests', canonical)
+        self.assertEqual(canonicalize(tags, canonical),
+                         Counter({'tests': 11, 'flask': 4}))
+
+    def test_feed(self):
+        clusters = tag_clusters(self.tags)
+        similar = get_similarities(self.tags)
+        for word, other in similar.items():
+            self.assertTrue(any(word in c and other in c for c in clusters))
+        self.assertIn(['challenges', 'challenge'], clusters)
+
+    def test_canonical_get_tags(self):
+        canonical = canonical_map(tag_clusters(self.tags))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'canonical.json')
+            self.assertEqual(load_canonical(path), {})
+            save_canonical(canonical, path)
+            canonical = load_canonical(path)
+        tags = get_tags(canonical=canonical)
+        self.assertEqual(tags, canonicalize(self.tags, canonical))
+        self.assertNotIn('challenge', tags)
+        self.assertEqual(sum(tags.values()), sum(self.tags.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
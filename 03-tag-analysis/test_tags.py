@@ -1,8 +1,13 @@
+import difflib
+import gzip
+import io
+import os
 import re
+import tempfile
 import unittest
 
 from tags import get_tags, get_top_tags
-from tags import get_similarities, TOP_NUMBER
+from tags import get_similarities, similar_pairs, TOP_NUMBER, RSS_FEED
 
 TAG_COUNT = re.compile(r'">([^<]+)</a>\s\((\d+)\)<')
 TAGS = 'tags.html'
@@ -28,6 +33,18 @@ class test_tags(unittest.TestCase):
         self.assertEqual(self.tags.get('collections'), 4)
         self.assertEqual(self.tags.get('python'), 10)
 
+    def test_get_tags_streams(self):
+        with open(RSS_FEED, 'rb') as f:
+            data = f.read()
+        self.assertEqual(get_tags(io.BytesIO(data)), self.tags)
+        self.assertEqual(get_tags(io.BytesIO(gzip.compress(data))),
+                         self.tags)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rss.xml.gz')
+            with gzip.open(path, 'wb') as f:
+                f.write(data)
+            self.assertEqual(get_tags(path), self.tags)
+
     def test_get_top_tags(self):
         top_tags = dict(get_top_tags(self.tags)).items()
         self.assertEqual(len(top_tags), TOP_NUMBER)
@@ -42,6 +59,19 @@ class test_tags(unittest.TestCase):
         self.assertIn(('challenge', 'challenges'), similar_tags)
         self.assertIn(('generator', 'generators'), similar_tags)
 
+    def test_similar_pairs_match_difflib(self):
+        words = sorted(['test', 'tests', 'testing', 'tester', 'game',
+                        'games', 'gamer', 'python', 'pythons', 'pyton',
+                        'a', 'ab', 'ba', 'abab', 'baba', 'aab', 'xyz'])
+        for cutoff in (0.87, 0.75, 0.5):
+            expected = {(word, other)
+                        for i, word in enumerate(words)
+                        for other in difflib.get_close_matches(
+                            word, words[i + 1:], n=len(words), cutoff=cutoff)}
+            found = {(word, other) for word, other, _
+                     in similar_pairs(words, cutoff)}
+            self.assertEqual(found, expected)
+
 
 if __name__ == "__main__":
     unittest.main()
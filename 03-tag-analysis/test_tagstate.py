@@ -0,0 +1,76 @@
+import io
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from tags import get_similarities, get_tags, get_top_tags, similar_pairs
+from tags import RSS_FEED, SIMILAR
+from tagstate import TagState
+
+
+def partial_feed(items):
+    """RSS_FEED with only its first items"""
+    tree = ET.parse(RSS_FEED)
+    channel = tree.getroot().find('channel')
+    for item in channel.findall('item')[items:]:
+        channel.remove(item)
+    f = io.BytesIO()
+    tree.write(f)
+    f.seek(0)
+    return f
+
+
+class TestTagState(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'state.json.gz')
+        self.tags = get_tags()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertMatchesFullRun(self, state):
+        self.assertEqual(state.tags, self.tags)
+        self.assertEqual(dict(state.top), dict(get_top_tags(self.tags)))
+        self.assertEqual(state.similarities, get_similarities(self.tags))
+
+    def test_update(self):
+        state = TagState(self.path)
+        self.assertEqual(state.update(), 28)
+        self.assertMatchesFullRun(state)
+        self.assertEqual(state.update(), 0)
+        self.assertEqual(state.tags, self.tags)
+
+    def test_incremental(self):
+        state = TagState(self.path)
+        self.assertEqual(state.update(partial_feed(10)), 10)
+        self.assertEqual(state.tags, get_tags(partial_feed(10)))
+        state.save()
+
+        state = TagState(self.path)
+        self.assertEqual(len(state.seen), 10)
+        self.assertEqual(state.update(), 18)
+        self.assertMatchesFullRun(state)
+        state.save()
+        self.assertEqual(TagState(self.path).update(), 0)
+
+    def test_kept_index(self):
+        state = TagState(self.path)
+        for items in (5, 10, 20):
+            state.update(partial_feed(items))
+        self.assertEqual(len(state._index), len(get_tags(partial_feed(20))))
+        state.update()
+        self.assertMatchesFullRun(state)
+
+    def test_similar_pairs_only(self):
+        words = sorted(self.tags)
+        pairs = set(similar_pairs(words, SIMILAR))
+        only = set(words[::3])
+        self.assertEqual(
+            sorted(similar_pairs(words, SIMILAR, only)),
+            sorted(pair for pair in pairs if only & set(pair[:2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from collections import Counter
+
+from tags import get_tags, get_top_tags, TOP_NUMBER
+from topk import SpaceSaving
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def setUp(self):
+        # a few heavy tags in a long tail of rare ones
+        rng = random.Random(14)
+        self.stream = [f'tag{int(rng.paretovariate(1))}'
+                       for _ in range(20000)]
+        self.exact = Counter(self.stream)
+
+    def test_exact_when_it_fits(self):
+        summary = SpaceSaving(len(self.exact), self.stream)
+        self.assertEqual(dict(summary.most_common()), self.exact)
+        self.assertFalse(any(summary.errors.values()))
+
+    def test_bounds(self):
+        capacity = 50
+        summary = SpaceSaving(capacity, self.stream)
+        self.assertEqual(len(summary), capacity)
+        self.assertEqual(summary.total, len(self.stream))
+        limit = len(self.stream) / capacity
+        for tag, count in summary.most_common():
+            self.assertLessEqual(summary.error(tag), limit)
+            self.assertLessEqual(count - summary.error(tag), self.exact[tag])
+            self.assertGreaterEqual(count, self.exact[tag])
+        for tag, count in self.exact.items():
+            if count > limit:
+                self.assertIn(tag, summary)
+
+    def test_guaranteed(self):
+        summary = SpaceSaving(50, self.stream)
+        top = dict(self.exact.most_common(5))
+        guaranteed = summary.guaranteed(5)
+        self.assertTrue(guaranteed)
+        for tag in guaranteed:
+            self.assertIn(tag, top)
+
+    def test_update_mapping(self):
+        summary = SpaceSaving(3, {'a': 5, 'b': 2})
+        summary.update(['c', 'd'])
+        self.assertEqual(summary.most_common(1), [('a', 5)])
+        self.assertEqual(summary['d'], 2)
+        self.assertEqual(summary.error('d'), 1)
+        self.assertNotIn('c', summary)
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+    def test_get_tags_capacity(self):
+        tags = get_tags()
+        summary = get_tags(capacity=len(tags))
+        self.assertEqual(dict(summary.most_common()), tags)
+        top = get_top_tags(get_tags(capacity=50))
+        self.assertEqual(len(top), TOP_NUMBER)
+        self.assertEqual(top[0], ('python', 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Approximate top tags in bounded memory, for tag streams too big to
+count exactly.
+
+SpaceSaving (Metwally et al.) monitors at most capacity tags. A tag
+that isn't monitored replaces the one with the lowest count and takes
+over that count as its possible overcount (error). After N tags:
+
+- every count is at most error too high: count - error <= true <= count
+- the lowest count, and so any error, is at most N / capacity
+- every tag seen more than N / capacity times is monitored
+"""
+import heapq
+
+DEFAULT_CAPACITY = 1000
+
+
+class SpaceSaving:
+    """Counter-like summary of the capacity most frequent tags"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, tags=()):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        # (count, tag) per monitored tag. Counts only go up, so an entry
+        # is never higher than the tag's current count: fix stale ones
+        # when they surface instead of on every increment.
+        self._heap = []
+        self.update(tags)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, tag):
+        return tag in self.counts
+
+    def __getitem__(self, tag):
+        """Estimated count, 0 for a tag that isn't monitored"""
+        return self.counts.get(tag, 0)
+
+    def __repr__(self):
+        return f'SpaceSaving({len(self)}/{self.capacity} tags, {self.total} seen)'
+
+    def add(self, tag, count=1):
+        self.total += count
+        if tag in self.counts:
+            self.counts[tag] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[tag] = count
+            self.errors[tag] = 0
+            heapq.heappush(self._heap, (count, tag))
+            return
+        lowest, evicted = self._pop_lowest()
+        del self.counts[evicted], self.errors[evicted]
+        self.counts[tag] = lowest + count
+        self.errors[tag] = lowest
+        heapq.heappush(self._heap, (lowest + count, tag))
+
+    def _pop_lowest(self):
+        while True:
+            count, tag = heapq.heappop(self._heap)
+            if count == self.counts[tag]:
+                return count, tag
+            heapq.heappush(self._heap, (self.counts[tag], tag))
+
+    def update(self, tags):
+        """Count an iterable of tags, or a mapping of tag -> count"""
+        if hasattr(tags, 'items'):
+            for tag, count in tags.items():
+                self.add(tag, count)
+        else:
+            for tag in tags:
+                self.add(tag)
+
+    def error(self, tag):
+        """How much tag's count may be too high"""
+        return self.errors.get(tag, 0)
+
+    def most_common(self, n=None):
+        """[(tag, estimated count)] like Counter.most_common"""
+        if n is None:
+            return sorted(self.counts.items(), key=lambda item: -item[1])
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def guaranteed(self, n):
+        """The tags of most_common(n) that are certainly in the true top n:
+        their lowest possible count beats the highest possible count of
+        every tag ranked after them"""
+        ranked = self.most_common()
+        # a tag that isn't monitored was seen at most the lowest count times
+        bound = ranked[n][1] if len(ranked) > n else (
+            min(self.counts.values()) if len(self) == self.capacity else 0)
+        return [tag for tag, count in ranked[:n]
+                if count - self.errors[tag] >= bound]
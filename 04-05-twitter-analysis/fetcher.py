@@ -0,0 +1,196 @@
+#! venv/bin/python
+"""Fetch the tweets of many handles at once.
+
+Fetching is waiting on the network, so every handle gets a thread.
+The threads share a token bucket per API endpoint to stay within its
+rate limit window, retry failed requests with exponential backoff and
+hand every page to the calling thread, which stores it right away
+(sqlite connections stay in the thread that made them).
+
+fetch_page is the only part that talks to Twitter: pass your own to
+fetch from a fake API in tests or experiments.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import random
+import sys
+import threading
+import time
+
+from tweetstore import Tweet, TweetStore
+from usertweets import NUM_TWEETS, twitter_api
+
+PAGE_SIZE = 200  # most user_timeline returns per request
+RATE_LIMIT = 900  # user_timeline requests per window, per user
+WINDOW = 15 * 60
+WORKERS = 8
+MAX_RETRIES = 4
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+RATE_LIMITED = (420, 429)
+
+
+class TokenBucket(object):
+    """Allow rate calls per seconds on average, at most capacity at once.
+    acquire() blocks until a call is allowed; safe to share by threads."""
+
+    def __init__(self, rate=RATE_LIMIT, per=WINDOW, capacity=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.fill_rate = rate / per
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self._last) * self.fill_rate)
+        self._last = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            self.sleep(wait)
+
+
+def fetch_page(handle, count=PAGE_SIZE, max_id=None, since_id=None):
+    """One page of handle's timeline, newest first, from the Twitter API"""
+    statuses = twitter_api().user_timeline(
+        id=handle, count=count, max_id=max_id, since_id=since_id,
+        tweet_mode='extended')
+    return [Tweet(status.id_str, status.created_at, str(status.full_text))
+            for status in statuses]
+
+
+def _response(exc):
+    return getattr(exc, 'response', None)
+
+
+def is_transient(exc):
+    """Whether trying again can help: network errors, server errors and
+    rate limiting, not errors like 401 or 404"""
+    status = getattr(_response(exc), 'status_code', None)
+    if status is None:
+        # tweepy wraps network errors in its own exception, without a
+        # response but with the original one as context
+        cause = exc.__cause__ or exc.__context__
+        return isinstance(exc, OSError) or isinstance(cause, OSError)
+    return status in RATE_LIMITED or status >= 500
+
+
+def rate_limit_wait(exc, clock=time.time):
+    """Seconds until the rate limit window of a rate limited response
+    resets, None if exc isn't one or doesn't say"""
+    response = _response(exc)
+    if getattr(response, 'status_code', None) not in RATE_LIMITED:
+        return None
+    reset = (getattr(response, 'headers', None) or {}).get(
+        'x-rate-limit-reset')
+    return max(0.0, float(reset) - clock()) if reset else None
+
+
+def with_retries(func, *args, retries=MAX_RETRIES, backoff=BACKOFF,
+                 sleep=time.sleep, clock=time.time, **kwargs):
+    """Call func, on a transient error try again up to retries times,
+    waiting twice as long every time (plus some jitter so threads don't
+    retry in lockstep), or until the rate limit resets when rate
+    limited. Other errors are raised right away."""
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if attempt == retries or not is_transient(exc):
+                raise
+            delay = rate_limit_wait(exc, clock)
+            if delay is None:
+                delay = min(MAX_BACKOFF, backoff * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.5)
+            print('retry {} in {:.1f}s: {!r}'.format(args, delay, exc))
+            sleep(delay)
+
+
+def _pages(handle, count, stored, id_range, get_page, bucket, sleep):
+    """Yield pages of tweets: those newer than the newest stored one,
+    then older ones until count are stored (stored already are)"""
+    oldest, newest = id_range
+
+    def page(**kwargs):
+        bucket.acquire()
+        return with_retries(get_page, handle, PAGE_SIZE, sleep=sleep,
+                            **kwargs)
+
+    if newest is not None:
+        max_id = None
+        while True:
+            tweets = page(max_id=max_id, since_id=newest)
+            if not tweets:
+                break
+            stored += len(tweets)
+            yield tweets
+            max_id = int(tweets[-1].id_str) - 1
+
+    max_id = oldest - 1 if oldest is not None else None
+    while stored < count:
+        tweets = page(max_id=max_id)
+        if not tweets:
+            break
+        stored += len(tweets)
+        yield tweets
+        max_id = int(tweets[-1].id_str) - 1
+
+
+def fetch_all(handles, count=NUM_TWEETS, store=None, get_page=fetch_page,
+              bucket=None, workers=WORKERS, sleep=time.sleep):
+    """Fetch handles concurrently until count tweets of each are in store.
+    Return ({handle: new tweets}, {handle: exception}) so one failing
+    handle doesn't stop the others. sleep is what retries wait with."""
+    store = store or TweetStore()
+    bucket = bucket or TokenBucket()
+    pages = queue.Queue()
+    done = object()
+
+    def fetch(handle, stored, id_range):
+        try:
+            for tweets in _pages(handle, count, stored, id_range,
+                                 get_page, bucket, sleep):
+                pages.put((handle, tweets))
+        finally:
+            pages.put((handle, done))
+
+    new = dict.fromkeys(handles, 0)
+    errors = {}
+    with ThreadPoolExecutor(workers) as pool:
+        futures = {
+            pool.submit(fetch, handle, store.count(handle),
+                        store.id_range(handle)): handle
+            for handle in new}
+        running = len(futures)
+        while running:
+            handle, tweets = pages.get()
+            if tweets is done:
+                running -= 1
+            else:
+                new[handle] += store.add(handle, tweets)
+    for future, handle in futures.items():
+        if future.exception():
+            errors[handle] = future.exception()
+    return new, errors
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('usage: fetcher.py HANDLE [...]')
+        sys.exit(1)
+    new, errors = fetch_all(sys.argv[1:])
+    for handle, count in new.items():
+        print('{:<20} {} new tweets'.format(handle, count))
+    for handle, exc in errors.items():
+        print('{:<20} failed: {!r}'.format(handle, exc))
@@ -0,0 +1,149 @@
+#! venv/bin/python
+"""TF-IDF profiles of handles, kept up to date tweet by tweet.
+
+Per handle the store keeps the counts of its (processed) words and the
+ids of the oldest and newest tweet counted, in the same SQLite file as
+the tweets. Tweets newer than that range, or older ones fetched later,
+only add to those counts, nothing gets tokenized twice.
+
+A handle's profile vector weighs every word count by how rare the word
+is among all handles (its inverse document frequency, a handle's tweets
+being one document) and is scaled to unit length. Vectors are cached;
+adding tweets to a handle only rebuilds its own vector and those of
+handles with a word it didn't have before (whose idf changed), from
+the stored counts. A new handle changes every idf and rebuilds all.
+"""
+from collections import Counter, defaultdict
+import math
+import sys
+
+from sparse import SparseVector, Vocabulary, cosine
+from textpipeline import default_pipeline
+from tweetstore import STORE_DB, TweetStore
+
+
+class ProfileStore(object):
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS profiles (
+            handle TEXT PRIMARY KEY COLLATE NOCASE,
+            oldest_id INTEGER NOT NULL,
+            newest_id INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS terms (
+            handle TEXT NOT NULL COLLATE NOCASE,
+            term TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (handle, term)
+        ) WITHOUT ROWID;
+    '''
+
+    def __init__(self, path=STORE_DB, pipeline=None):
+        # profiles live next to the tweets, in the same database
+        self.tweet_store = TweetStore(path)
+        self.db = self.tweet_store.db
+        with self.db:
+            self.db.executescript(self.SCHEMA)
+        self.pipeline = pipeline or default_pipeline()
+
+        # handle -> (oldest, newest) id counted, handles are lowercase
+        self.counted = {
+            handle.lower(): (oldest, newest)
+            for handle, oldest, newest in self.db.execute(
+                'SELECT handle, oldest_id, newest_id FROM profiles')}
+        self.counts = defaultdict(Counter)
+        for handle, term, count in self.db.execute(
+                'SELECT handle, term, count FROM terms'):
+            self.counts[handle.lower()][term] = count
+        self.df = Counter(term for counts in self.counts.values()
+                          for term in counts)
+        self.vocab = Vocabulary()
+        self._vectors = {}
+
+    def __len__(self):
+        return len(self.counted)
+
+    def update(self, handle, tweets=None):
+        """Count the tweets (Tweet tuples, default: those in the tweet
+        store) of handle newer or older than the ones counted so far.
+        Like the store, every tweet between the oldest and newest one
+        counted is taken to be counted. Return how many tweets were new."""
+        handle = handle.lower()
+        oldest, newest = self.counted.get(handle, (None, None))
+        if tweets is None:
+            tweets = self.tweet_store.tweets(handle, since_id=newest)
+            if oldest is not None:
+                tweets += self.tweet_store.tweets(handle, max_id=oldest - 1)
+        tweets = [tweet for tweet in tweets if oldest is None or
+                  not oldest <= int(tweet.id_str) <= newest]
+        if not tweets:
+            return 0
+
+        counts = self.pipeline.process([tweet.text for tweet in tweets])
+        ids = [int(tweet.id_str) for tweet in tweets]
+        if oldest is not None:
+            ids += [oldest, newest]
+        oldest, newest = min(ids), max(ids)
+        with self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO profiles (handle, oldest_id, '
+                'newest_id) VALUES (?, ?, ?)', (handle, oldest, newest))
+            self.db.executemany(
+                'INSERT INTO terms (handle, term, count) VALUES (?, ?, ?) '
+                'ON CONFLICT (handle, term) DO UPDATE SET '
+                'count = count + excluded.count',
+                ((handle, term, count) for term, count in counts.items()))
+
+        profile = self.counts[handle]
+        new_terms = [term for term in counts if term not in profile]
+        profile.update(counts)
+        self.df.update(new_terms)
+        if handle not in self.counted:
+            self._vectors.clear()
+        else:
+            self._vectors.pop(handle, None)
+            for other in list(self._vectors):
+                if any(term in self.counts[other] for term in new_terms):
+                    del self._vectors[other]
+        self.counted[handle] = oldest, newest
+        return len(tweets)
+
+    def idf(self, term):
+        # smoothed, so a word every handle uses still counts a little
+        return math.log((1 + len(self)) / (1 + self.df[term])) + 1
+
+    def vector(self, handle):
+        """Unit length TF-IDF SparseVector of handle"""
+        handle = handle.lower()
+        if handle not in self._vectors:
+            vector = self.vocab.vector({
+                term: count * self.idf(term)
+                for term, count in self.counts[handle].items()})
+            if vector.norm:
+                vector = SparseVector(vector.indices,
+                                      vector.data / vector.norm)
+            self._vectors[handle] = vector
+        return self._vectors[handle]
+
+    def similarity(self, handle1, handle2):
+        return cosine(self.vector(handle1), self.vector(handle2))
+
+    def similarities(self, handle):
+        """[(other handle, similarity)] for every other handle, most
+        similar first"""
+        handle = handle.lower()
+        scores = [(other, self.similarity(handle, other))
+                  for other in self.counted if other != handle]
+        return sorted(scores, key=lambda score: -score[1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('usage: profiles.py HANDLE [...]')
+        sys.exit(1)
+    store = ProfileStore()
+    for handle in sys.argv[1:]:
+        print('{:<16} {} new tweets'.format(handle, store.update(handle)))
+    for handle in sys.argv[1:]:
+        print('--- {} ---'.format(handle))
+        for other, score in store.similarities(handle)[:5]:
+            print('{:<16} {:.3f}'.format(other, score))
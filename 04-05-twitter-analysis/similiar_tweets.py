@@ -1,20 +1,19 @@
 #! venv/bin/python
 from pprint import pprint
 from usertweets import UserTweets
-import string
+from fetcher import fetch_all
+from sparse import Vocabulary, cosine, cosine_matrix, nearest
+import sys
 
-import numpy as np
+from textpipeline import default_pipeline
 
-from collections import Counter
 
-from nltk.tokenize import casual
-from nltk.corpus import stopwords
-from nltk import PorterStemmer
-
-
-def main(handle1, handle2, n_tweets):
-    tweets1 = fetch_tweets(handle1, n_tweets)
-    tweets2 = fetch_tweets(handle2, n_tweets)
+def main(handle1, handle2, n_tweets, offline=False, store=None):
+    # Fetch both at once (unless offline), then read them from the store
+    if not offline:
+        fetch_handles((handle1, handle2), n_tweets, store)
+    tweets1 = fetch_tweets(handle1, n_tweets, offline=True, store=store)
+    tweets2 = fetch_tweets(handle2, n_tweets, offline=True, store=store)
 
     tweets1 = process_tweets(tweets1)
     tweets2 = process_tweets(tweets2)
@@ -26,53 +25,68 @@ def similarity_score(dict1, dict2):
     '''
     dict#: A Counter dict of word freq calculated from a document
     '''
-    # Create vocab of all words
-    vocab = list(dict1.keys()) + list(dict2.keys())
-    vocab_size = len(vocab)
-    print(f'vocab size: {vocab_size}')
+    # Shared vocab of all words, each vector only holds its own words
+    vocab = Vocabulary()
+    vec1 = vocab.vector(dict1)
+    vec2 = vocab.vector(dict2)
+    print(f'vocab size: {len(vocab)}')
 
-    vec1 = np.zeros(vocab_size, dtype=np.int)
-    vec2 = np.zeros(vocab_size, dtype=np.int)
+    return cosine(vec1, vec2)
 
-    for i, word in enumerate(vocab):
-        vec1[i] = dict1.get(word, 0)
-        vec2[i] = dict2.get(word, 0)
-    return cos_sim(vec1, vec2)
 
+def similarity_matrix(handles, n_tweets, offline=False, store=None):
+    '''
+    Fetch (unless offline, then only use the stored tweets) and process
+    the tweets of each handle once, return the N x N array of similarity
+    scores between all handles
+    '''
+    if not offline:
+        fetch_handles(handles, n_tweets, store)
+    vocab = Vocabulary()
+    vectors = [
+        vocab.vector(process_tweets(fetch_tweets(handle, n_tweets,
+                                                 offline=True, store=store)))
+        for handle in handles]
+    return cosine_matrix(vectors, len(vocab))
 
-def cos_sim(a, b):
-    # Compute cosine of angle between 2 vectors
-    # Also, inner (dot) product of vectors normalized to length 1
-    dot_prod = np.dot(a, b)
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
-    return dot_prod / (norm_a * norm_b)
 
+def most_similar(handles, similarities, k=3):
+    '''
+    {handle: [(other handle, score)]} of the k most similar handles
+    '''
+    return {
+        handle: [(handles[col], score) for col, score in row]
+        for handle, row in zip(handles, nearest(similarities, k))}
 
-def fetch_tweets(handle, n):
-    tweets = UserTweets(handle, n).tweets
 
-    tweets = [tweet.text for tweet in tweets]
-    return tweets
+class FetchError(Exception):
+    def __init__(self, errors):
+        # errors: {handle: exception}
+        self.errors = errors
+        super().__init__('fetching failed for ' + ', '.join(
+            f'{handle} ({exc!r})' for handle, exc in errors.items()))
+
+
+def fetch_handles(handles, n_tweets, store=None):
+    '''
+    Fetch the tweets of handles into the store, raise FetchError naming
+    the handles that failed
+    '''
+    _, errors = fetch_all(handles, n_tweets, store)
+    if errors:
+        raise FetchError(errors)
 
 
-def process_tweets(tweets):
-    token_tweets = tokenize_tweets(tweets)
+def fetch_tweets(handle, n, offline=False, store=None):
+    tweets = UserTweets(handle, n, store=store, offline=offline).tweets
 
-    # Stemming
-    porter = PorterStemmer()
-    stemmed_tokens = (porter.stem(w) for tw in token_tweets for w in tw)
+    tweets = [tweet.text for tweet in tweets]
+    return tweets
 
-    # Remove tokens that are links
-    stemmed_tokens = filter(lambda t: not t.startswith("https://"),
-                            stemmed_tokens)
-    # Stop words and punctuation
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = (
-        tok for tok in stemmed_tokens
-        if tok not in stop_words and tok not in string.punctuation)
 
-    return Counter(filtered_tokens)
+def process_tweets(tweets, processes=1):
+    # Tokenize, stem and filter in the shared pipeline
+    return default_pipeline().process(tweets, processes)
 
 
 def tokenize_tweets(tweets):
@@ -81,21 +95,7 @@ def tokenize_tweets(tweets):
     like newlines, symbols, etc.
     Some are retweets and comments.
     '''
-    def only_tweets(tw):
-        # No retweets or comments
-        if tw.startswith('RT') or tw.startswith('@'):
-            return False
-        return True
-
-    tweets = filter(only_tweets, tweets)
-
-    # lambda in map so we can pass args
-    tweets = list(
-        map(
-            lambda tw: casual.casual_tokenize(
-                tw, preserve_case=True, reduce_len=True), tweets))
-
-    return tweets
+    return default_pipeline().tokenize(tweets)
 
 
 if __name__ == "__main__":
@@ -107,6 +107,16 @@ if __name__ == "__main__":
                ('Schwarzenegger', 0.149423), ('raymondh', 0.142598),
                ('github', 0.064402), ('lifehacker', 0.057078))
     n_tweets = 1000
-    score = main('tiedyeblotter', 'petitetaint', n_tweets)
+    # --offline: only the tweets in the store, no API (keys) needed
+    offline = '--offline' in sys.argv
+    if '--all' in sys.argv:
+        handles = [handle for handle, _ in queries]
+        similarities = similarity_matrix(handles, n_tweets, offline)
+        for handle, closest in most_similar(handles, similarities).items():
+            print('{:<16} {}'.format(handle, ', '.join(
+                f'{other} ({score:.3f})' for other, score in closest)))
+        sys.exit()
+
+    score = main('tiedyeblotter', 'petitetaint', n_tweets, offline)
 
     print(f"sim score between {n_tweets} tweets: {score}")
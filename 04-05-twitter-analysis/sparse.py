@@ -0,0 +1,108 @@
+"""Sparse word count vectors.
+
+A document only has a few of all the words in the vocabulary, so a
+vector keeps just the ids of the words it has (sorted) and their counts,
+like a row of a CSR matrix. Work and memory scale with those non-zero
+terms, not with the vocabulary size.
+
+For many documents at once, stack their unit length vectors into one
+CSR matrix M: M @ M.T holds the cosines of all pairs.
+"""
+import numpy as np
+from scipy import sparse
+
+
+class Vocabulary(object):
+    """Gives every distinct word an integer id, in order of appearance"""
+
+    def __init__(self, words=()):
+        self.ids = {}
+        self.words = []
+        for word in words:
+            self.id(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    def id(self, word):
+        """The id of word, added to the vocabulary if it's new"""
+        try:
+            return self.ids[word]
+        except KeyError:
+            self.ids[word] = len(self.words)
+            self.words.append(word)
+            return self.ids[word]
+
+    def vector(self, counts):
+        """SparseVector of a {word: count} mapping like a Counter"""
+        ids = np.fromiter((self.id(word) for word in counts), dtype=np.int64,
+                          count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64,
+                             count=len(counts))
+        order = np.argsort(ids)
+        return SparseVector(ids[order], values[order])
+
+
+class SparseVector(object):
+    """indices: ascending word ids, data: the count of each"""
+    __slots__ = ('indices', 'data', 'norm')
+
+    def __init__(self, indices, data):
+        self.indices = indices
+        self.data = data
+        self.norm = np.sqrt(np.dot(data, data))
+
+    def __len__(self):
+        return len(self.indices)
+
+    def dot(self, other):
+        # only words in both vectors add to the dot product
+        _, mine, theirs = np.intersect1d(self.indices, other.indices,
+                                         assume_unique=True,
+                                         return_indices=True)
+        return float(np.dot(self.data[mine], other.data[theirs]))
+
+
+def cosine(a, b):
+    """Cosine of the angle between SparseVectors a and b, 0 if either is
+    empty"""
+    if not a.norm or not b.norm:
+        return 0.0
+    return a.dot(b) / (a.norm * b.norm)
+
+
+def stack(vectors, size=None):
+    """CSR matrix with the vectors scaled to unit length as its rows.
+    size: number of columns, the vocabulary size"""
+    indptr = np.cumsum([0] + [len(vector) for vector in vectors])
+    indices = np.concatenate([vector.indices for vector in vectors])
+    data = np.concatenate([vector.data / (vector.norm or 1)
+                           for vector in vectors])
+    if size is None:
+        size = indices.max() + 1 if len(indices) else 0
+    return sparse.csr_matrix((data, indices, indptr),
+                             shape=(len(vectors), size))
+
+
+def cosine_matrix(vectors, size=None):
+    """N x N array with the cosine of every pair of vectors, in one
+    sparse matrix product"""
+    rows = stack(vectors, size)
+    return (rows @ rows.T).toarray()
+
+
+def nearest(similarities, k):
+    """For every row the (column, similarity) of its k most similar other
+    rows, most similar first"""
+    similarities = np.array(similarities, dtype=np.float64)
+    np.fill_diagonal(similarities, -np.inf)
+    k = min(k, len(similarities) - 1)
+    result = []
+    for row in similarities:
+        top = np.argpartition(-row, k - 1)[:k] if k > 0 else []
+        top = sorted(top, key=lambda col: -row[col])
+        result.append([(int(col), float(row[col])) for col in top])
+    return result
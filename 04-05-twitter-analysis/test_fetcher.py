@@ -0,0 +1,210 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from fetcher import (PAGE_SIZE, TokenBucket, fetch_all, is_transient,
+                     with_retries)
+from test_tweetstore import tweets
+from tweetstore import TweetStore
+
+
+class FakeClock(object):
+    """Time that only moves when something sleeps"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+class ApiError(Exception):
+    def __init__(self, status, **headers):
+        super().__init__(status)
+        self.response = SimpleNamespace(status_code=status, headers=headers)
+
+
+def failing(*errors, result='ok'):
+    """Function raising errors one call at a time, then returning result"""
+    errors = list(errors)
+    calls = []
+
+    def func(*args, **kwargs):
+        calls.append(args)
+        if errors:
+            raise errors.pop(0)
+        return result
+    func.calls = calls
+    return func
+
+
+class FakeTimeline(object):
+    """get_page over timelines of ids 1..size per handle"""
+
+    def __init__(self, size=500, barrier=None, fail=None):
+        self.size = size
+        self.barrier = barrier
+        self.fail = fail or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, handle, count, max_id=None, since_id=None):
+        with self._lock:
+            self.calls.append(handle)
+            first = self.calls.count(handle) == 1
+        if first and self.barrier:
+            # only passes when all handles are fetched at the same time
+            self.barrier.wait()
+        if handle in self.fail:
+            raise self.fail[handle]
+        top = min(self.size, max_id or self.size)
+        ids = range(top, since_id or 0, -1)
+        return tweets(*ids[:count])
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate_window(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=3, per=30, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(clock.now, 0)
+        bucket.acquire()
+        self.assertAlmostEqual(clock.now, 10)
+        for _ in range(6):
+            bucket.acquire()
+        self.assertAlmostEqual(clock.now, 70)
+
+    def test_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, per=10, capacity=2, clock=clock,
+                             sleep=clock.sleep)
+        clock.now = 100  # idle long enough to fill up, but only to 2
+        for _ in range(3):
+            bucket.acquire()
+        self.assertAlmostEqual(clock.now, 101)
+
+
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(1000)
+
+    def retry(self, func, retries=3):
+        return with_retries(func, 'pybites', retries=retries, backoff=1.0,
+                            sleep=self.clock.sleep, clock=self.clock)
+
+    def test_transient(self):
+        func = failing(ApiError(503), ConnectionError('reset'))
+        self.assertEqual(self.retry(func), 'ok')
+        self.assertEqual(len(func.calls), 3)
+        first, second = self.clock.sleeps
+        self.assertTrue(0.5 <= first <= 1.5)
+        self.assertTrue(1.0 <= second <= 3.0)
+
+    def test_permanent(self):
+        for status in (401, 404):
+            func = failing(ApiError(status))
+            with self.assertRaises(ApiError):
+                self.retry(func)
+            self.assertEqual(len(func.calls), 1)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_rate_limit_reset(self):
+        func = failing(ApiError(429, **{'x-rate-limit-reset': '1060'}),
+                       ApiError(429))
+        self.assertEqual(self.retry(func), 'ok')
+        self.assertEqual(self.clock.sleeps[0], 60)
+        self.assertTrue(1.0 <= self.clock.sleeps[1] <= 3.0)
+
+    def test_gives_up(self):
+        func = failing(*[ApiError(500)] * 3)
+        with self.assertRaises(ApiError):
+            self.retry(func, retries=2)
+        self.assertEqual(len(func.calls), 3)
+
+    def test_is_transient(self):
+        try:
+            try:
+                raise ConnectionError('refused')
+            except OSError:
+                raise Exception('Failed to send request')
+        except Exception as exc:
+            wrapped = exc
+        self.assertTrue(is_transient(wrapped))
+        self.assertTrue(is_transient(ApiError(420)))
+        self.assertFalse(is_transient(ApiError(403)))
+        self.assertFalse(is_transient(ValueError('bad page')))
+
+
+class TestFetchAll(unittest.TestCase):
+    def setUp(self):
+        self.store = TweetStore(':memory:')
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(clock=self.clock, sleep=self.clock.sleep)
+
+    def tearDown(self):
+        self.store.close()
+
+    def fetch(self, handles, count, get_page, **kwargs):
+        kwargs.setdefault('bucket', self.bucket)
+        return fetch_all(handles, count, self.store, get_page,
+                         sleep=self.clock.sleep, **kwargs)
+
+    def test_fetch_all(self):
+        timeline = FakeTimeline(size=500)
+        new, errors = self.fetch(['pybites', 'bbelderbos'], 300, timeline)
+        self.assertEqual(new, {'pybites': 2 * PAGE_SIZE,
+                               'bbelderbos': 2 * PAGE_SIZE})
+        self.assertEqual(errors, {})
+        self.assertEqual(self.store.id_range('pybites'), (101, 500))
+
+        timeline.size = 550  # 50 new tweets, then the 100 older ones
+        new, _ = self.fetch(['pybites'], 500, timeline)
+        self.assertEqual(new, {'pybites': 150})
+        self.assertEqual(self.store.count('pybites'), 550)
+
+    def test_concurrent(self):
+        handles = ['pybites', 'bbelderbos', 'juliansequeira']
+        barrier = threading.Barrier(len(handles), timeout=5)
+        timeline = FakeTimeline(size=100, barrier=barrier)
+        new, errors = self.fetch(handles, 100, timeline,
+                                 workers=len(handles))
+        self.assertEqual(errors, {})
+        self.assertEqual(new, dict.fromkeys(handles, 100))
+
+    def test_errors(self):
+        missing = ApiError(404)
+        timeline = FakeTimeline(size=100, fail={'nobody': missing})
+        new, errors = self.fetch(['pybites', 'nobody'], 100, timeline)
+        self.assertEqual(new, {'pybites': 100, 'nobody': 0})
+        self.assertEqual(errors, {'nobody': missing})
+        self.assertEqual(timeline.calls.count('nobody'), 1)
+
+    def test_retries(self):
+        flaky = failing(ApiError(503), ApiError(502),
+                        result=tweets(*range(100, 0, -1)))
+        new, errors = self.fetch(['pybites'], 100, flaky)
+        self.assertEqual((new, errors), ({'pybites': 100}, {}))
+        self.assertEqual(len(flaky.calls), 3)
+
+    def test_rate_window(self):
+        # 4 handles x 3 pages with 2 requests per 10s allowed
+        bucket = TokenBucket(rate=2, per=10, clock=self.clock,
+                             sleep=self.clock.sleep)
+        timeline = FakeTimeline(size=1000)
+        handles = ['a', 'b', 'c', 'd']
+        new, _ = self.fetch(handles, 3 * PAGE_SIZE, timeline, bucket=bucket)
+        self.assertEqual(new, dict.fromkeys(handles, 3 * PAGE_SIZE))
+        self.assertEqual(len(timeline.calls), 12)
+        self.assertGreaterEqual(self.clock.now, (12 - 2) * 5 - 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
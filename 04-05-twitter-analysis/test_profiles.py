@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from profiles import ProfileStore
+from tweetstore import Tweet
+
+TEXTS = {
+    'pybites': ['Python code challenge', 'Flask and Django tips',
+                'Python testing with pytest', 'A new Python challenge'],
+    'bbelderbos': ['Python tips for testing', 'Django code review',
+                   'Learning Python every day'],
+    'tferriss': ['Morning routine and tea', 'Podcast about sleep',
+                 'Tea and a morning walk'],
+}
+
+
+def tweets(handle, start=0, end=None):
+    """Tweets of handle, ids 1.. in the order of TEXTS, newest first"""
+    texts = TEXTS[handle]
+    return [Tweet(str(i + 1), '2017-12-01', texts[i])
+            for i in reversed(range(len(texts)))][start:end]
+
+
+class TestProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'tweets.db')
+        self.store = ProfileStore(self.path)
+        for handle in TEXTS:
+            self.store.tweet_store.add(handle, tweets(handle))
+
+    def tearDown(self):
+        self.store.db.close()
+        self.tmp.cleanup()
+
+    def test_update(self):
+        self.assertEqual(self.store.update('pybites'), 4)
+        self.assertEqual(self.store.update('pybites'), 0)
+        self.assertEqual(self.store.counts['pybites']['python'], 3)
+        self.assertEqual(self.store.counted['pybites'], (1, 4))
+
+    def test_handle_case(self):
+        self.assertEqual(self.store.update('pybites'), 4)
+        self.assertEqual(self.store.update('PyBites'), 0)
+        self.assertEqual(self.store.counts['pybites']['python'], 3)
+        self.assertEqual(len(self.store), 1)
+        self.assertAlmostEqual(self.store.similarity('PYBITES', 'pybites'),
+                               1.0)
+
+    def test_newer_and_older(self):
+        # the store had the middle two, then newer and older ones came in
+        self.assertEqual(self.store.update('pybites', tweets('pybites', 1, 3)),
+                         2)
+        self.assertEqual(self.store.update('pybites'), 2)
+        self.assertEqual(self.store.update('pybites', tweets('pybites')), 0)
+        self.assertEqual(self.store.counts['pybites']['python'], 3)
+        self.assertEqual(self.store.counted['pybites'], (1, 4))
+
+    def test_similarities(self):
+        for handle in TEXTS:
+            self.store.update(handle)
+        ranked = self.store.similarities('pybites')
+        self.assertEqual([other for other, _ in ranked],
+                         ['bbelderbos', 'tferriss'])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_reload(self):
+        self.store.update('pybites')
+        self.store.update('tferriss', tweets('tferriss', 1))
+        vector = self.store.vector('pybites')  # cached, then invalidated
+        self.store.update('bbelderbos')
+        self.store.update('tferriss')
+        loaded = ProfileStore(self.path)
+        self.assertEqual(loaded.counted, self.store.counted)
+        self.assertEqual(loaded.counts, self.store.counts)
+        for handle in TEXTS:
+            for other in TEXTS:
+                self.assertAlmostEqual(loaded.similarity(handle, other),
+                                       self.store.similarity(handle, other))
+        self.assertEqual(len(vector), len(self.store.counts['pybites']))
+        loaded.db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+
+import similiar_tweets
+from similiar_tweets import (FetchError, main, most_similar,
+                             similarity_matrix)
+from tweetstore import Tweet, TweetStore
+
+TEXTS = {
+    'pybites': ['Python code challenge', 'Flask and Django tips',
+                'Python testing with pytest'],
+    'bbelderbos': ['Python tips for testing', 'Django code review'],
+    'tferriss': ['Morning routine and tea', 'Podcast about sleep'],
+}
+
+
+def no_fetching(*args, **kwargs):
+    raise AssertionError('offline, nothing should be fetched')
+
+
+class TestSimilarTweets(unittest.TestCase):
+    def setUp(self):
+        self.store = TweetStore(':memory:')
+        for handle, texts in TEXTS.items():
+            self.store.add(handle, [Tweet(str(i), '2017-12-01', text)
+                                    for i, text in enumerate(texts, 1)])
+        patcher = patch.object(similiar_tweets, 'fetch_all', no_fetching)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_main_offline(self):
+        close = main('pybites', 'bbelderbos', 10, offline=True,
+                     store=self.store)
+        far = main('pybites', 'tferriss', 10, offline=True, store=self.store)
+        self.assertGreater(close, far)
+        self.assertTrue(0 < close < 1)
+        self.assertEqual(far, 0.0)
+
+    def test_similarity_matrix_offline(self):
+        handles = list(TEXTS)
+        similarities = similarity_matrix(handles, 10, offline=True,
+                                         store=self.store)
+        self.assertEqual(similarities.shape, (3, 3))
+        for i in range(3):
+            self.assertAlmostEqual(similarities[i][i], 1.0)
+        self.assertAlmostEqual(
+            similarities[0][1],
+            main('pybites', 'bbelderbos', 10, offline=True,
+                 store=self.store))
+        closest = most_similar(handles, similarities, k=1)
+        self.assertEqual(closest['pybites'][0][0], 'bbelderbos')
+
+    def test_fetch_errors(self):
+        missing = LookupError('no such handle')
+        with patch.object(similiar_tweets, 'fetch_all',
+                          lambda *args: ({}, {'nobody': missing})):
+            with self.assertRaises(FetchError) as raised:
+                main('pybites', 'nobody', 10, store=self.store)
+        self.assertEqual(raised.exception.errors, {'nobody': missing})
+
+
+if __name__ == "__main__":
+    unittest.main()
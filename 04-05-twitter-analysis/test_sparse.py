@@ -0,0 +1,110 @@
+from collections import Counter
+import random
+import unittest
+
+import numpy as np
+
+from sparse import SparseVector, Vocabulary, cosine, cosine_matrix, nearest
+
+WORDS = ['python', 'code', 'challenge', 'tweet', 'bites', 'flask', 'django',
+         'test', 'data', 'news']
+
+
+def random_counts(rng, size=6):
+    return Counter({word: rng.randint(1, 5)
+                    for word in rng.sample(WORDS, size)})
+
+
+def dense(vocab, counts):
+    vector = np.zeros(len(vocab))
+    for word, count in counts.items():
+        vector[vocab.ids[word]] = count
+    return vector
+
+
+def dense_cosine(a, b):
+    norms = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(np.dot(a, b) / norms) if norms else 0.0
+
+
+class TestSparse(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(16)
+
+    def test_vocabulary(self):
+        vocab = Vocabulary(['python', 'code', 'python'])
+        self.assertEqual(len(vocab), 2)
+        self.assertEqual(vocab.id('code'), 1)
+        self.assertEqual(vocab.id('tweet'), 2)
+        self.assertIn('tweet', vocab)
+        self.assertEqual(vocab.words, ['python', 'code', 'tweet'])
+
+    def test_vector(self):
+        vocab = Vocabulary(['python', 'code'])
+        vector = vocab.vector(Counter({'tweet': 3, 'python': 1, 'code': 2}))
+        self.assertEqual(vector.indices.tolist(), [0, 1, 2])
+        self.assertEqual(vector.data.tolist(), [1, 2, 3])
+        self.assertAlmostEqual(vector.norm, 14 ** 0.5)
+        self.assertEqual(len(vector), 3)
+
+    def test_cosine_matches_dense(self):
+        for _ in range(20):
+            vocab = Vocabulary()
+            counts = [random_counts(self.rng, self.rng.randint(1, 8))
+                      for _ in range(2)]
+            a, b = [vocab.vector(count) for count in counts]
+            expected = dense_cosine(*[dense(vocab, count)
+                                      for count in counts])
+            self.assertAlmostEqual(cosine(a, b), expected)
+            self.assertAlmostEqual(a.dot(b), float(np.dot(
+                *[dense(vocab, count) for count in counts])))
+
+    def test_cosine_edge_cases(self):
+        vocab = Vocabulary()
+        a = vocab.vector(Counter({'python': 2, 'code': 1}))
+        b = vocab.vector(Counter({'tweet': 4}))
+        empty = SparseVector(np.array([], dtype=np.int64), np.array([]))
+        self.assertAlmostEqual(cosine(a, a), 1.0)
+        self.assertEqual(cosine(a, b), 0.0)
+        self.assertEqual(cosine(a, empty), 0.0)
+
+    def test_cosine_matrix_matches_dense(self):
+        vocab = Vocabulary()
+        counts = [random_counts(self.rng, self.rng.randint(1, 8))
+                  for _ in range(12)] + [Counter()]
+        vectors = [vocab.vector(count) for count in counts]
+        similarities = cosine_matrix(vectors, len(vocab))
+        dense_vectors = [dense(vocab, count) for count in counts]
+        expected = [[dense_cosine(a, b) for b in dense_vectors]
+                    for a in dense_vectors]
+        np.testing.assert_allclose(similarities, expected, atol=1e-12)
+
+    def test_nearest(self):
+        similarities = [[1.0, 0.2, 0.9, 0.5],
+                        [0.2, 1.0, 0.1, 0.3],
+                        [0.9, 0.1, 1.0, 0.4],
+                        [0.5, 0.3, 0.4, 1.0]]
+        self.assertEqual(nearest(similarities, 2), [
+            [(2, 0.9), (3, 0.5)],
+            [(3, 0.3), (0, 0.2)],
+            [(0, 0.9), (3, 0.4)],
+            [(0, 0.5), (2, 0.4)]])
+        # never itself, and k is capped at the other rows
+        self.assertEqual(nearest(similarities, 10)[1],
+                         [(3, 0.3), (0, 0.2), (2, 0.1)])
+        self.assertEqual(nearest([[1.0]], 3), [[]])
+        self.assertEqual(similarities[0][0], 1.0)  # input left alone
+
+    def test_nearest_matches_sort(self):
+        vocab = Vocabulary()
+        vectors = [vocab.vector(random_counts(self.rng)) for _ in range(20)]
+        similarities = cosine_matrix(vectors, len(vocab))
+        for row, closest in enumerate(nearest(similarities, 3)):
+            others = sorted((-similarities[row][col], col)
+                            for col in range(20) if col != row)
+            self.assertEqual([score for _, score in closest],
+                             [-score for score, _ in others[:3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
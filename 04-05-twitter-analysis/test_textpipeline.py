@@ -0,0 +1,83 @@
+from collections import Counter
+import string
+import unittest
+
+from nltk import PorterStemmer
+from nltk.corpus import stopwords
+from nltk.tokenize import casual
+
+from textpipeline import TextPipeline
+
+TWEETS = [
+    'New #Python code challenge is up: https://pybit.es/codechallenge04.html',
+    'RT @pybites: Twitter data analysis with Python!!!',
+    '@bbelderbos thanks, loooooving the challenges :)',
+    'Testing, tested and tests... the Pythonic waaaaay (or not?)',
+    'Running and runners ran — the stemmer is caching these words',
+    'https://t.co/abc https://t.co/def #100DaysOfCode ()',
+    '',
+]
+
+
+def old_process_tweets(tweets):
+    """process_tweets as it was before the shared pipeline"""
+    tweets = [tw for tw in tweets
+              if not (tw.startswith('RT') or tw.startswith('@'))]
+    token_tweets = [casual.casual_tokenize(tw, preserve_case=True,
+                                           reduce_len=True)
+                    for tw in tweets]
+    porter = PorterStemmer()
+    stemmed_tokens = (porter.stem(w) for tw in token_tweets for w in tw)
+    stemmed_tokens = filter(lambda t: not t.startswith("https://"),
+                            stemmed_tokens)
+    stop_words = set(stopwords.words('english'))
+    return Counter(
+        tok for tok in stemmed_tokens
+        if tok not in stop_words and tok not in string.punctuation)
+
+
+class TestTextPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = TextPipeline()
+        self.tweets = TWEETS * 3
+
+    def test_tokenize(self):
+        tokens = self.pipeline.tokenize(TWEETS)
+        self.assertEqual(len(tokens), len(TWEETS) - 2)
+        self.assertIn('#Python', tokens[0])
+        self.assertIn('waaay', tokens[1])  # reduce_len
+
+    def test_matches_old_process_tweets(self):
+        expected = old_process_tweets(self.tweets)
+        self.assertTrue(expected)
+        self.assertEqual(self.pipeline.process(self.tweets), expected)
+        # the stem cache doesn't change anything the second time
+        self.assertEqual(self.pipeline.process(self.tweets), expected)
+
+    def test_process_pool(self):
+        expected = old_process_tweets(self.tweets)
+        self.assertEqual(
+            self.pipeline.process(self.tweets, processes=2, chunk_size=4),
+            expected)
+
+    def test_process_pool_settings(self):
+        # workers count with this pipeline's stop words, not English ones
+        pipeline = TextPipeline('dutch', cache_size=16)
+        tweets = ['De code van het project is een feest',
+                  'Python en de tests'] * 4
+        serial = pipeline.process(tweets)
+        self.assertNotIn('de', serial)
+        self.assertIn('is', serial)  # an English stop word
+        self.assertEqual(
+            pipeline.process(tweets, processes=2, chunk_size=2), serial)
+
+    def test_filtered(self):
+        counts = self.pipeline.process(TWEETS)
+        for token in counts:
+            self.assertFalse(token.startswith('https://'))
+            self.assertNotIn(token, string.punctuation)
+        self.assertNotIn('thank', counts)  # only in a comment
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from tweetstore import Tweet, TweetStore
+
+
+def tweets(*ids):
+    return [Tweet(str(id_), '2017-12-0{}'.format(id_ % 9 + 1),
+                  'tweet {}'.format(id_)) for id_ in ids]
+
+
+class TestTweetStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TweetStore(':memory:')
+        self.store.add('pybites', tweets(3, 1, 2))
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_add(self):
+        self.assertEqual(self.store.add('pybites', tweets(2, 3, 4)), 1)
+        self.assertEqual(self.store.add('bbelderbos', tweets(2)), 1)
+        self.assertEqual(self.store.count('pybites'), 4)
+        self.assertEqual(self.store.count('bbelderbos'), 1)
+
+    def test_tweets(self):
+        self.assertEqual(self.store.tweets('pybites'), tweets(3, 2, 1))
+        self.assertEqual(self.store.tweets('pybites', count=2), tweets(3, 2))
+        self.assertEqual(self.store.tweets('pybites', max_id=2), tweets(2, 1))
+        self.assertEqual(self.store.tweets('pybites', since_id=1),
+                         tweets(3, 2))
+        self.assertEqual(self.store.tweets('nobody'), [])
+
+    def test_count_and_id_range(self):
+        self.assertEqual(self.store.count('pybites', max_id=2), 2)
+        self.assertEqual(self.store.id_range('pybites'), (1, 3))
+        self.assertEqual(self.store.id_range('nobody'), (None, None))
+
+    def test_handle_case(self):
+        self.assertEqual(self.store.add('PyBites', tweets(3, 4)), 1)
+        self.assertEqual(self.store.tweets('PYBITES'), tweets(4, 3, 2, 1))
+        self.assertEqual(self.store.count('PyBites'), 4)
+        handles = self.store.db.execute('SELECT DISTINCT handle FROM tweets')
+        self.assertEqual([handle for handle, in handles], ['pybites'])
+
+    def test_export_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pybites.csv')
+            self.store.export_csv('pybites', path)
+            with open(path, newline='') as f:
+                rows = [Tweet(**row) for row in csv.DictReader(f)]
+        self.assertEqual(rows, tweets(3, 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from test_tweetstore import tweets
+from tweetstore import TweetStore
+import usertweets
+from usertweets import UserTweets
+
+
+class FakeApiUserTweets(UserTweets):
+    """UserTweets on a timeline of ids 1..TIMELINE, newest first"""
+    TIMELINE = 10
+
+    def _get_tweets(self, count, max_id=None, since_id=None):
+        self.calls.append((count, max_id, since_id))
+        ids = [id_ for id_ in range(self.TIMELINE, 0, -1)
+               if (max_id is None or id_ <= max_id) and
+               (since_id is None or id_ > since_id)]
+        return tweets(*ids[:count or None])
+
+
+class TestUserTweets(unittest.TestCase):
+    def setUp(self):
+        self.store = TweetStore(':memory:')
+        self.store.add('pybites', tweets(5, 4, 3))
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(usertweets, 'DEST_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeApiUserTweets.calls = []
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_offline(self):
+        user = UserTweets('PyBites', count=2, store=self.store, offline=True)
+        self.assertEqual(user.handle, 'pybites')
+        self.assertEqual(len(user), 2)
+        self.assertEqual(user[:], tweets(5, 4))
+        user = UserTweets('pybites', max_id=4, store=self.store, offline=True)
+        self.assertEqual(list(user), tweets(4, 3))
+
+    def test_offline_unknown_handle(self):
+        user = UserTweets('nobody', store=self.store, offline=True)
+        self.assertEqual(len(user), 0)
+
+    def test_fill_gaps(self):
+        user = FakeApiUserTweets('pybites', count=10, store=self.store)
+        # everything newer than the store, then older ones up to count
+        self.assertEqual(user.calls, [(0, None, 5), (2, 2, None)])
+        self.assertEqual(user.tweets, tweets(*range(10, 0, -1)))
+        self.assertTrue(user.output_file.exists())
+
+        user = FakeApiUserTweets('pybites', count=10, store=self.store)
+        self.assertEqual(user.calls[-1], (0, None, 10))
+        self.assertEqual(len(user), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tweets to word counts: tokenize, stem, drop links, stop words and
+punctuation.
+
+The stemmer, stop words and punctuation are set up once per pipeline
+and stems are cached: tweets repeat the same words over and over, so
+most tokens are a dict lookup instead of a run of the Porter stemmer.
+Big batches of tweets are split in chunks over a process pool.
+"""
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+import string
+
+from nltk.tokenize import casual
+from nltk.corpus import stopwords
+from nltk import PorterStemmer
+
+STEM_CACHE_SIZE = 2 ** 16
+CHUNK_SIZE = 2000
+
+
+class TextPipeline(object):
+    def __init__(self, language='english', cache_size=STEM_CACHE_SIZE):
+        self.language = language
+        self.cache_size = cache_size
+        self.stop_words = frozenset(stopwords.words(language))
+        # tokens were filtered with `tok not in string.punctuation`, a
+        # substring test: keep dropping every substring, like '()'
+        punctuation = string.punctuation
+        self.punctuation = frozenset(
+            punctuation[i:j] for i in range(len(punctuation) + 1)
+            for j in range(i, len(punctuation) + 1))
+        self.stem = lru_cache(maxsize=cache_size)(PorterStemmer().stem)
+
+    @staticmethod
+    def only_tweets(tweet):
+        # No retweets or comments
+        return not (tweet.startswith('RT') or tweet.startswith('@'))
+
+    def tokenize(self, tweets):
+        '''
+        tweets: List of strings, each a tweet. Each contains noise,
+        like newlines, symbols, etc.
+        Return the tokens of each tweet that isn't a retweet or comment.
+        '''
+        return [casual.casual_tokenize(tweet, preserve_case=True,
+                                       reduce_len=True)
+                for tweet in tweets if self.only_tweets(tweet)]
+
+    def process(self, tweets, processes=1, chunk_size=CHUNK_SIZE):
+        '''
+        Counter of the stemmed words in tweets, without links, stop words
+        and punctuation. With processes other than 1 (None: one per cpu)
+        chunks of chunk_size tweets are counted in a process pool.
+        '''
+        tweets = list(tweets)
+        if processes == 1 or len(tweets) <= chunk_size:
+            return self._count(tweets)
+        chunks = [tweets[i:i + chunk_size]
+                  for i in range(0, len(tweets), chunk_size)]
+        counts = Counter()
+        # every worker builds a pipeline with the same settings as this one
+        with Pool(processes, _init_worker,
+                  (self.language, self.cache_size)) as pool:
+            for chunk_counts in pool.imap_unordered(_count_chunk, chunks):
+                counts.update(chunk_counts)
+        return counts
+
+    def _count(self, tweets):
+        stem = self.stem
+        stop_words = self.stop_words
+        punctuation = self.punctuation
+        counts = Counter()
+        for tokens in self.tokenize(tweets):
+            for token in tokens:
+                token = stem(token)
+                if (token.startswith('https://') or token in stop_words or
+                        token in punctuation):
+                    continue
+                counts[token] += 1
+        return counts
+
+
+@lru_cache(maxsize=None)
+def default_pipeline():
+    """The pipeline of this process, built on first use"""
+    return TextPipeline()
+
+
+_worker_pipeline = None
+
+
+def _init_worker(language, cache_size):
+    global _worker_pipeline
+    _worker_pipeline = TextPipeline(language, cache_size)
+
+
+def _count_chunk(tweets):
+    return _worker_pipeline._count(tweets)
@@ -0,0 +1,83 @@
+"""Local tweet corpus: every tweet fetched so far, per handle, in SQLite.
+
+UserTweets reads from here first and only asks the API for tweets
+newer or older than what's stored, so repeated analyses, and analyses
+without network or API keys, don't need the API at all.
+"""
+from collections import namedtuple
+import csv
+from pathlib import Path
+import sqlite3
+
+STORE_DB = 'data/tweets.db'
+FIELDS = ['id_str', 'created_at', 'text']
+
+Tweet = namedtuple('Tweet', FIELDS)
+
+
+class TweetStore(object):
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS tweets (
+            handle TEXT NOT NULL COLLATE NOCASE,  -- stored lowercase
+            id INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (handle, id)
+        ) WITHOUT ROWID;
+    '''
+
+    def __init__(self, path=STORE_DB):
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        with self.db:
+            self.db.executescript(self.SCHEMA)
+
+    def add(self, handle, tweets):
+        """Store tweets (Tweet tuples) of handle, return how many were new"""
+        handle = handle.lower()
+        before = self.db.total_changes
+        with self.db:
+            self.db.executemany(
+                'INSERT OR IGNORE INTO tweets (handle, id, created_at, text) '
+                'VALUES (?, ?, ?, ?)',
+                ((handle, int(tweet.id_str), str(tweet.created_at), tweet.text)
+                 for tweet in tweets))
+        return self.db.total_changes - before
+
+    def tweets(self, handle, count=None, max_id=None, since_id=None):
+        """Up to count stored tweets of handle, newest first, only those
+        with an id up to max_id and above since_id if given"""
+        rows = self.db.execute(
+            'SELECT id, created_at, text FROM tweets '
+            'WHERE handle = ? AND id <= ? AND id > ? '
+            'ORDER BY id DESC LIMIT ?',
+            (handle.lower(), max_id if max_id is not None else 2 ** 63 - 1,
+             since_id if since_id is not None else -1,
+             count if count is not None else -1))
+        return [Tweet(str(id_), created_at, text)
+                for id_, created_at, text in rows]
+
+    def count(self, handle, max_id=None):
+        return self.db.execute(
+            'SELECT COUNT(*) FROM tweets WHERE handle = ? AND id <= ?',
+            (handle.lower(), max_id if max_id is not None else 2 ** 63 - 1)
+        ).fetchone()[0]
+
+    def id_range(self, handle):
+        """(oldest id, newest id) stored for handle, (None, None) if none"""
+        return self.db.execute(
+            'SELECT MIN(id), MAX(id) FROM tweets WHERE handle = ?',
+            (handle.lower(),)).fetchone()
+
+    def export_csv(self, handle, path):
+        """Write handle's tweets to a csv file like UserTweets used to"""
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDS)
+            writer.writeheader()
+            for tweet in self.tweets(handle):
+                writer.writerow(tweet._asdict())
+
+    def close(self):
+        self.db.close()
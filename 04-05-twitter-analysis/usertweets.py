@@ -1,65 +1,95 @@
 #! venv/bin/python
-from collections import namedtuple
-import csv
+from functools import lru_cache
 from pathlib import Path
 from pprint import pprint
 
-import tweepy
-
-from config import CONSUMER_KEY, CONSUMER_SECRET
-from config import ACCESS_TOKEN, ACCESS_SECRET
+from tweetstore import Tweet, TweetStore
 
 DEST_DIR = 'data'
 EXT = 'csv'
 NUM_TWEETS = 100
 
-Tweet = namedtuple('Tweet', 'id_str created_at text')
 
-auth = tweepy.OAuthHandler(CONSUMER_KEY, CONSUMER_SECRET)
-auth.set_access_token(ACCESS_TOKEN, ACCESS_SECRET)
-API = tweepy.API(auth)
+@lru_cache(maxsize=None)
+def twitter_api():
+    # Only import tweepy and read the keys once the API is really needed,
+    # tweets already in the store work without either
+    import tweepy
+
+    from config import CONSUMER_KEY, CONSUMER_SECRET
+    from config import ACCESS_TOKEN, ACCESS_SECRET
+
+    auth = tweepy.OAuthHandler(CONSUMER_KEY, CONSUMER_SECRET)
+    auth.set_access_token(ACCESS_TOKEN, ACCESS_SECRET)
+    return tweepy.API(auth)
 
 
 class UserTweets(object):
-    def __init__(self, handle, count=NUM_TWEETS, max_id=None):
+    def __init__(self, handle, count=NUM_TWEETS, max_id=None, store=None,
+                 api=None, offline=False):
         # max_id: Get tweets starting at a particular id
         # None means get most recent tweets.
+        # store: TweetStore to read from first, api: tweepy.API to fill
+        # the gaps with, offline: never call the API.
+
+        # Instance vars, handles are case insensitive
+        self.handle = handle.lower()
+        self.store = store or TweetStore()
+        self._api = api
+        new = 0 if offline else self._fill_gaps(count, max_id)
+        self.tweets = self.store.tweets(self.handle, count, max_id)
+        print('UserTweets {}: got {} tweets, {} new'.format(
+            self.handle, len(self.tweets), new))
+        if new:
+            self._save_tweets()
+
+    @property
+    def api(self):
+        if self._api is None:
+            self._api = twitter_api()
+        return self._api
+
+    def _fill_gaps(self, count, max_id):
+        """Fetch what the store is missing: tweets newer than the newest
+        stored one (for the most recent tweets) and older than the oldest
+        one until there are count of them. Return how many were new."""
+        oldest, newest = self.store.id_range(self.handle)
+        new = 0
+        if newest is not None and max_id is None:
+            # all of them (a count of 0), or there'd be a gap in the store
+            new += self.store.add(self.handle,
+                                  self._get_tweets(0, since_id=newest))
+        missing = count - self.store.count(self.handle, max_id)
+        if missing > 0:
+            if oldest is not None and (max_id is None or max_id >= oldest):
+                max_id = oldest - 1
+            new += self.store.add(self.handle,
+                                  self._get_tweets(missing, max_id=max_id))
+        return new
+
+    def _get_tweets(self, count, max_id=None, since_id=None):
+        import tweepy
 
-        # Instance vars
-        self.handle = handle
-        self.tweets = self._get_tweets(count, max_id)
-        self._save_tweets()
-
-    def _get_tweets(self, count, max_id):
         tweets = [
             status
-            for status in tweepy.Cursor(API.user_timeline,
+            for status in tweepy.Cursor(self.api.user_timeline,
                                         id=self.handle,
                                         max_id=max_id,
+                                        since_id=since_id,
                                         tweet_mode='extended').items(count)
         ]
         tweets = [
             Tweet(tweet.id_str, tweet.created_at, str(tweet.full_text))
             for tweet in tweets
         ]
-        print('UserTweets {}: got {} tweets'.format(self.handle, len(tweets)))
-
         return tweets
 
     def _save_tweets(self):
-        # Make /data folder and write .csv inside.
-        out = Path('./data')
+        # Make /data folder and export the stored tweets as .csv inside.
+        out = Path(DEST_DIR)
         out.mkdir(exist_ok=True)
-        self.output_file = out / (self.handle + '.csv')
-
-        with self.output_file.open('w', newline='') as csvfile:
-            fieldnames = ['id_str', 'created_at', 'text']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-
-            for tweet in self.tweets:
-                writer.writerow(tweet._asdict())
+        self.output_file = out / (self.handle + '.' + EXT)
+        self.store.export_csv(self.handle, self.output_file)
 
     # These two functions below let UserTweets support Iteration pattern
     def __len__(self):
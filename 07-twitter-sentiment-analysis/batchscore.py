@@ -0,0 +1,175 @@
+#!venv/bin/python
+"""Score the sentiment of many tweets at once.
+
+The JSON lines input is cut in shards of about SHARD_BYTES (whole
+compressed files are one shard), a process pool scores the shards and
+the main process writes (id, polarity, subjectivity) rows to a CSV or
+Parquet file and adds up a summary. Every worker sets up the sentiment
+analyzer and its lexicon once, not per tweet.
+
+    batchscore.py data_*.json -o scores.csv
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+from contextlib import contextmanager
+
+from textblob.sentiments import PatternAnalyzer
+
+from sentiment import (get_text, input_compression, loads, open_input,
+                       process)
+
+SHARD_BYTES = 16 * 1024 ** 2
+FIELDS = ['id', 'polarity', 'subjectivity']
+
+_analyzer = None
+
+
+class Summary:
+    """Aggregate sentiment of scored tweets, add two together to merge"""
+
+    def __init__(self):
+        self.tweets = 0
+        self.positive = 0
+        self.negative = 0
+        self.polarity = 0.0
+        self.subjectivity = 0.0
+
+    def __add__(self, other):
+        total = Summary()
+        for name, value in vars(self).items():
+            setattr(total, name, value + getattr(other, name))
+        return total
+
+    def add(self, polarity, subjectivity):
+        self.tweets += 1
+        self.positive += polarity > 0
+        self.negative += polarity < 0
+        self.polarity += polarity
+        self.subjectivity += subjectivity
+
+    @property
+    def neutral(self):
+        return self.tweets - self.positive - self.negative
+
+    def report(self):
+        n = self.tweets or 1
+        return '\n'.join([
+            f'tweets: {self.tweets}',
+            f'mean polarity: {self.polarity / n:.4f}, '
+            f'mean subjectivity: {self.subjectivity / n:.4f}',
+            f'positive: {self.positive} ({self.positive / n:.1%}), '
+            f'neutral: {self.neutral} ({self.neutral / n:.1%}), '
+            f'negative: {self.negative} ({self.negative / n:.1%})',
+        ])
+
+
+def shards(paths, shard_bytes=SHARD_BYTES):
+    """(path, start, end) byte ranges covering paths, end None means
+    the whole (compressed) file"""
+    for path in paths:
+        # compressed streams can't be split, whatever the file is called
+        if input_compression(path):
+            yield path, 0, None
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, size, shard_bytes):
+            yield path, start, min(start + shard_bytes, size)
+
+
+def read_shard(path, start, end):
+    """Lines of path that start in [start, end)"""
+    if end is None:
+        with open_input(path) as f:
+            yield from f
+        return
+    with open(path, 'rb') as f:
+        if start:
+            # the line running into start belongs to the previous shard
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line
+
+
+def _init_worker():
+    global _analyzer
+    _analyzer = PatternAnalyzer()
+    _analyzer.analyze('warm up')  # loads the lexicon
+
+
+def score_shard(shard):
+    """Return ([(id, polarity, subjectivity)], Summary) for a shard"""
+    if _analyzer is None:
+        _init_worker()
+    rows = []
+    summary = Summary()
+    for line in read_shard(*shard):
+        if not line.strip():
+            continue
+        tweet = loads(line)
+        polarity, subjectivity = _analyzer.analyze(process(get_text(tweet)))
+        rows.append((tweet.get('id_str', tweet.get('id')), polarity,
+                     subjectivity))
+        summary.add(polarity, subjectivity)
+    return rows, summary
+
+
+@contextmanager
+def row_writer(path):
+    """Yield a function writing rows to path, Parquet (needs pyarrow)
+    when path ends with .parquet, CSV otherwise"""
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([('id', pa.string()),
+                            ('polarity', pa.float64()),
+                            ('subjectivity', pa.float64())])
+
+        def write(rows):
+            if rows:
+                ids, polarities, subjectivities = zip(*rows)
+                writer.write_table(pa.table(
+                    [[str(id_) for id_ in ids], polarities, subjectivities],
+                    schema=schema))
+
+        with pq.ParquetWriter(path, schema) as writer:
+            yield write
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            yield writer.writerows
+
+
+def score_files(paths, output, processes=None, shard_bytes=SHARD_BYTES):
+    """Score all tweets in paths over a process pool, write the rows to
+    output and return the Summary"""
+    summary = Summary()
+    with row_writer(output) as write, \
+            multiprocessing.Pool(processes, _init_worker) as pool:
+        for rows, part in pool.imap_unordered(
+                score_shard, list(shards(paths, shard_bytes))):
+            write(rows)
+            summary += part
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score the sentiment of tweets in JSON lines files')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-o', '--output', default='scores.csv',
+                        help='.csv or .parquet, default %(default)s')
+    parser.add_argument('-p', '--processes', type=int,
+                        help='worker processes, default: one per cpu')
+    args = parser.parse_args()
+    print(score_files(args.files, args.output, args.processes).report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Long running tweet collection from the filter stream.
+
+Reconnects when the connection drops, backing off the way Twitter asks
+clients to: linearly for network errors, exponentially for HTTP errors
+and starting at a minute when rate limited (420/429). Progress (last
+tweet id, counts, files) is checkpointed to a JSON file, so a restarted
+collection picks up its counts where it stopped. Only tweets the sink
+has written out count as collected, tweets still queued when the
+process dies are not in the checkpoint either.
+
+The stream is read with plain requests from a configurable url, so a
+local fake streaming endpoint can stand in for Twitter.
+"""
+from collections import Counter
+import json
+import os
+import time
+
+import requests
+
+STREAM_URL = 'https://stream.twitter.com/1.1/statuses/filter.json'
+CHECKPOINT = 'collect.checkpoint.json'
+CHECKPOINT_EVERY = 10.0
+READ_TIMEOUT = 90  # Twitter sends a keep-alive every 30 seconds
+NETWORK_BACKOFF = (0.25, 16)
+HTTP_BACKOFF = (5, 320)
+RATE_LIMIT_BACKOFF = (60, 960)
+RATE_LIMITED = (420, 429)
+
+
+class Checkpoint(object):
+    """Collection progress, saved as JSON"""
+
+    def __init__(self, path=CHECKPOINT):
+        self.path = path
+        self.last_id = None
+        self.count = 0
+        self.dropped = 0
+        self.files = []
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.last_id = state['last_id']
+            self.count = state['count']
+            self.dropped = state['dropped']
+            self.files = state['files']
+
+    def save(self):
+        tmp = '{}.tmp'.format(self.path)
+        with open(tmp, 'w') as f:
+            json.dump({'last_id': self.last_id, 'count': self.count,
+                       'dropped': self.dropped, 'files': self.files}, f)
+        os.replace(tmp, self.path)
+
+
+class Throughput(object):
+    """Tweets per second since the last report"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._last = clock()
+        self._count = 0
+
+    def add(self, count=1):
+        self._count += count
+
+    def rate(self):
+        now = self.clock()
+        rate = self._count / max(now - self._last, 1e-9)
+        self._last, self._count = now, 0
+        return rate
+
+
+def error_kind(exc):
+    """'rate limit', 'http' or 'network', they back off differently"""
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status in RATE_LIMITED:
+        return 'rate limit'
+    return 'network' if status is None else 'http'
+
+
+def backoff(exc, attempt):
+    """Seconds to wait before reconnecting after exc, attempt (0 based)
+    counts the failures of the same kind in a row"""
+    kind = error_kind(exc)
+    if kind == 'network':
+        start, cap = NETWORK_BACKOFF
+        return min(cap, start * (attempt + 1))
+    start, cap = RATE_LIMIT_BACKOFF if kind == 'rate limit' else HTTP_BACKOFF
+    return min(cap, start * 2 ** attempt)
+
+
+def stream(url, params, auth=None, timeout=READ_TIMEOUT):
+    """Yield the messages of a streaming endpoint, one JSON object per
+    line, until the connection ends"""
+    with requests.post(url, data=params, auth=auth, stream=True,
+                       timeout=(10, timeout)) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:  # skip keep-alive newlines
+                yield json.loads(line)
+
+
+def collect(track, sink, max_tweets=None, checkpoint=None, url=STREAM_URL,
+            auth=None, lang='en', sleep=time.sleep, max_retries=None):
+    """Put tweets matching track from the stream in sink until
+    max_tweets are collected (None: forever), reconnecting on errors.
+    Closes sink when done and returns the checkpoint."""
+    checkpoint = checkpoint or Checkpoint()
+    # the sink counts for this run only
+    count, dropped = checkpoint.count, checkpoint.dropped
+    files = list(checkpoint.files)
+    accepted = 0
+    last_id = checkpoint.last_id
+    throughput = Throughput()
+    last_report = time.monotonic()
+    failures = Counter()
+
+    def report():
+        written, last_written = sink.progress()
+        checkpoint.count = count + written
+        if last_written is not None:
+            checkpoint.last_id = last_written['id']
+        checkpoint.dropped = dropped + sink.dropped
+        checkpoint.files = files + sink.files
+        checkpoint.save()
+        seen = checkpoint.count + checkpoint.dropped
+        print('{} tweets, {:.1f}/s, {} dropped ({:.1%}), {} queued'.format(
+            checkpoint.count, throughput.rate(), checkpoint.dropped,
+            checkpoint.dropped / seen if seen else 0, sink.pending))
+
+    try:
+        while max_tweets is None or count + accepted < max_tweets:
+            messages = stream(url, {'track': track}, auth)
+            try:
+                for message in messages:
+                    failures.clear()
+                    # skip notices (limit, delete, ...) and repeats
+                    tweet_id = message.get('id')
+                    if tweet_id is None or message.get('lang') != lang:
+                        continue
+                    if last_id and tweet_id <= last_id:
+                        continue
+                    if sink.put(message):
+                        accepted += 1
+                        throughput.add()
+                    last_id = tweet_id
+                    if time.monotonic() - last_report >= CHECKPOINT_EVERY:
+                        report()
+                        last_report = time.monotonic()
+                    if max_tweets is not None and \
+                            count + accepted >= max_tweets:
+                        break
+                else:
+                    raise requests.ConnectionError('stream ended')
+            except (requests.RequestException, ValueError) as exc:
+                kind = error_kind(exc)
+                if max_retries is not None and failures[kind] >= max_retries:
+                    raise
+                delay = backoff(exc, failures[kind])
+                failures[kind] += 1
+                print('reconnecting in {:.2f}s: {!r}'.format(delay, exc))
+                sleep(delay)
+            finally:
+                messages.close()
+    finally:
+        sink.close()
+        report()
+    return checkpoint
@@ -5,17 +5,19 @@
 # https://github.com/joelgrus/data-science-from-scratch/blob/master/code-python3/getting_data.py
 #
 ####
-import json
-import sys
-import time
+import argparse
 
+from requests_oauthlib import OAuth1
 from twython import TwythonStreamer
 
+import collector
+from sink import JsonlSink
+
 from config import CONSUMER_KEY, CONSUMER_SECRET
 from config import ACCESS_TOKEN, ACCESS_SECRET
 
 MAX_TWEETS = 1000
-OUTPUT = 'data_{}.json'.format(int(time.time()))
+OUTPUT_PREFIX = 'data'
 
 
 class MyStreamer(TwythonStreamer):
@@ -23,19 +25,26 @@ class MyStreamer(TwythonStreamer):
     how to interact with the stream"""
     count = 0
 
+    def __init__(self, *args, sink=None, max_tweets=MAX_TWEETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sink = sink or JsonlSink(OUTPUT_PREFIX)
+        self.max_tweets = max_tweets
+
     def on_success(self, data):
         """what do we do when twitter sends us data?
         here data will be a Python object representing a tweet"""
 
         # only want to collect English-language tweets
-        if data['lang'] == 'en':
-            print(data)
-            with open(OUTPUT, 'a') as f:
-                f.write(json.dumps(data) + '\n')
+        if data.get('lang') == 'en':
+            # written out by the sink's own thread
+            self.sink.put(data)
             self.count += 1
+            if self.count % 100 == 0:
+                print('{} tweets, {} dropped'.format(self.count,
+                                                     self.sink.dropped))
 
         # stop when we've collected enough
-        if self.count >= MAX_TWEETS:
+        if self.count >= self.max_tweets:
             self.disconnect()
 
     def on_error(self, status_code, data):
@@ -43,10 +52,47 @@ class MyStreamer(TwythonStreamer):
         self.disconnect()
 
 
-if __name__ == "__main__":
-    keywords_and = ' '.join(sys.argv[1:])
+def main():
+    parser = argparse.ArgumentParser(
+        description='Collect English tweets matching all keywords')
+    parser.add_argument('keywords', nargs='+')
+    parser.add_argument('-n', '--max-tweets', type=int, default=MAX_TWEETS,
+                        help='stop after this many, default %(default)s')
+    parser.add_argument('--daemon', action='store_true',
+                        help='reconnect on errors and checkpoint progress, '
+                        'run until --max-tweets (0: forever)')
+    parser.add_argument('--checkpoint', default=collector.CHECKPOINT)
+    parser.add_argument('--url', default=collector.STREAM_URL,
+                        help='streaming endpoint, e.g. a local fake one')
+    parser.add_argument('--prefix', default=OUTPUT_PREFIX)
+    parser.add_argument('--compression', choices=('gzip', 'zstd'))
+    parser.add_argument('--hourly', action='store_true',
+                        help='start a new file every hour')
+    args = parser.parse_args()
+    keywords_and = ' '.join(args.keywords)
 
-    stream = MyStreamer(CONSUMER_KEY, CONSUMER_SECRET, ACCESS_TOKEN,
-                        ACCESS_SECRET)
+    sink = JsonlSink(args.prefix, hourly=args.hourly,
+                     compression=args.compression)
+    try:
+        if args.daemon:
+            auth = OAuth1(CONSUMER_KEY, CONSUMER_SECRET, ACCESS_TOKEN,
+                          ACCESS_SECRET)
+            collector.collect(keywords_and, sink, args.max_tweets or None,
+                              collector.Checkpoint(args.checkpoint),
+                              url=args.url, auth=auth)
+        else:
+            stream = MyStreamer(CONSUMER_KEY, CONSUMER_SECRET, ACCESS_TOKEN,
+                                ACCESS_SECRET, sink=sink,
+                                max_tweets=args.max_tweets)
+            stream.statuses.filter(track=keywords_and,
+                                   tweet_mode='extended')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+        print('wrote {} tweets to {}'.format(sink.written,
+                                             ', '.join(sink.files)))
 
-    stream.statuses.filter(track=keywords_and, tweet_mode='extended')
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 #!venv/bin/python
-import json
+import gzip
+import io
 import sys
 import string
 import re
@@ -7,11 +8,71 @@ from textblob import TextBlob
 from pprint import pprint
 from nltk.tokenize import casual
 
+try:
+    # optional, a lot faster than json
+    from orjson import loads
+except ImportError:
+    from json import loads
 
-def read_json(input_file):
-    with open(input_file) as f:
-        for line in f.readlines():
-            yield json.loads(line)
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+TEXT = 'text'
+EXTENDED_TEXT = 'retweeted_status.extended_tweet.full_text'
+TEXT_FIELDS = (TEXT, 'full_text', EXTENDED_TEXT)
+
+
+def input_compression(input_file):
+    ''''gzip', 'zstd' or None, going by the first bytes of input_file,
+    not its name'''
+    with open(input_file, 'rb') as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if magic == ZSTD_MAGIC:
+        return 'zstd'
+    return None
+
+
+def open_input(input_file):
+    '''Open input_file for reading bytes, decompressing gzip or zstd
+    (needs the zstandard package) files on the fly'''
+    compression = input_compression(input_file)
+    # open by path, so closing the result closes the file too
+    if compression == 'gzip':
+        return gzip.open(input_file)
+    if compression == 'zstd':
+        import zstandard
+        # the zstd reader has no readline, buffer it to read lines
+        return io.BufferedReader(zstandard.open(input_file, 'rb'))
+    return open(input_file, 'rb')
+
+
+def get_field(tweet, path):
+    '''Value at a dotted path like 'user.screen_name', None if missing.
+    Also works on the {path: value} dicts read_json yields for fields.'''
+    if path in tweet:
+        return tweet[path]
+    for key in path.split('.'):
+        if not isinstance(tweet, dict):
+            return None
+        tweet = tweet.get(key)
+    return tweet
+
+
+def read_json(input_file, fields=None, loads=loads):
+    '''Yield the tweets in a JSON lines file one at a time, so memory use
+    doesn't grow with the file. With fields (dotted paths) yield just
+    {path: value} of those. loads parses a line (bytes), orjson's if
+    installed, else json's.'''
+    with open_input(input_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            tweet = loads(line)
+            if fields is None:
+                yield tweet
+            else:
+                yield {path: get_field(tweet, path) for path in fields}
 
 
 def get_text(tweet):
@@ -21,15 +82,10 @@ def get_text(tweet):
         full_text
         a retweet, so the text is buried deeper
     '''
-    text = tweet['text']
+    text = get_field(tweet, TEXT) or get_field(tweet, 'full_text') or ''
     if text.startswith('RT'):
-        try:
-            text = tweet.get('retweeted_status').get('extended_tweet').get(
-                'full_text')
-            # print('using extended tweet')
-        except Exception as err:
-            pass
-            # print('using normal text')
+        # the extended tweet if there is one, else the normal text
+        text = get_field(tweet, EXTENDED_TEXT) or text
 
     return text
 
@@ -58,9 +114,9 @@ if __name__ == "__main__":
         print('please provide json data file')
         sys.exit(1)
     input_file = sys.argv[1]
-    tweets = read_json(input_file)
+    # only parse out what get_text needs
+    tweets = read_json(input_file, TEXT_FIELDS)
     for tw in tweets:
-        tw = dict(tw)
         # pprint(tw)
         tweet_text = get_text(tw)
         # print(tweet_text)
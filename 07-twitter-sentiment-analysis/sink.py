@@ -0,0 +1,164 @@
+"""Write tweets to JSON lines files from a background thread.
+
+The stream callback only puts a tweet in a bounded queue and returns,
+a writer thread serializes and buffers them and writes the buffer out
+once it's big or old enough. Files are rotated by size and/or every
+hour and can be gzip or zstd compressed. When the disk can't keep up
+the queue fills and new tweets are dropped (and counted) instead of
+stalling the stream connection.
+"""
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+MAX_BYTES = 64 * 1024 ** 2
+FLUSH_BYTES = 256 * 1024
+FLUSH_INTERVAL = 5.0
+QUEUE_SIZE = 10000
+EXTENSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+_STOP = object()
+
+
+def open_compressed(path, compression=None):
+    """Binary file for writing, compressing with gzip or zstd if asked"""
+    if compression is None:
+        return open(path, 'wb')
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'zstd':
+        # optional, pip install zstandard
+        import zstandard
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    raise ValueError('unknown compression {!r}'.format(compression))
+
+
+class JsonlSink(object):
+    """Buffered, rotating JSON lines writer fed through a bounded queue.
+    Files are named <prefix>_<unix time>_<part>.json[.gz|.zst]."""
+
+    def __init__(self, prefix='data', max_bytes=MAX_BYTES, hourly=False,
+                 compression=None, flush_bytes=FLUSH_BYTES,
+                 flush_interval=FLUSH_INTERVAL, queue_size=QUEUE_SIZE):
+        if compression not in EXTENSIONS:
+            raise ValueError('unknown compression {!r}'.format(compression))
+        if compression == 'zstd':
+            import zstandard  # fail here, not in the writer thread
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.hourly = hourly
+        self.compression = compression
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.files = []
+        self.written = 0
+        self.last_written = None  # the last record written out
+        self.dropped = 0
+        self.error = None
+
+        self._queue = queue.Queue(queue_size)
+        self._file = None
+        self._file_bytes = 0
+        self._hour = None
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._last_buffered = None
+        self._progress_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='jsonl-sink')
+        self._thread.start()
+
+    def put(self, record):
+        """Queue record for writing, never blocks. Return False if the
+        queue was full and record got dropped."""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def progress(self):
+        """(written, last_written) as of the same flush"""
+        with self._progress_lock:
+            return self.written, self.last_written
+
+    @property
+    def pending(self):
+        """Records queued but not written yet"""
+        return self._queue.qsize() + len(self._buffer)
+
+    def close(self):
+        """Write everything queued so far and close the file"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    record = self._queue.get(
+                        timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    record = None
+                if record is _STOP:
+                    break
+                if record is not None:
+                    line = (json.dumps(record) + '\n').encode()
+                    self._buffer.append(line)
+                    self._buffer_bytes += len(line)
+                    self._last_buffered = record
+                if (self._buffer_bytes >= self.flush_bytes or
+                        time.monotonic() >= deadline):
+                    self._flush()
+                    deadline = time.monotonic() + self.flush_interval
+            self._flush()
+        except Exception as exc:
+            # keep draining so put() never blocks on a dead writer
+            self.error = exc
+            while self._queue.get() is not _STOP:
+                self.dropped += 1
+        finally:
+            if self._file:
+                self._file.close()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        if self._needs_rotation():
+            self._rotate()
+        self._file.write(b''.join(self._buffer))
+        self._file.flush()
+        self._file_bytes += self._buffer_bytes
+        with self._progress_lock:
+            self.written += len(self._buffer)
+            self.last_written = self._last_buffered
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def _needs_rotation(self):
+        if self._file is None or self._file_bytes >= self.max_bytes:
+            return True
+        return self.hourly and time.strftime('%Y%m%d%H') != self._hour
+
+    def _rotate(self):
+        if self._file:
+            self._file.close()
+        path = '{}_{}_{:03d}.json{}'.format(
+            self.prefix, int(time.time()), len(self.files),
+            EXTENSIONS[self.compression])
+        self._file = open_compressed(path, self.compression)
+        self._file_bytes = 0
+        self._hour = time.strftime('%Y%m%d%H')
+        self.files.append(os.path.abspath(path))
@@ -0,0 +1,140 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from batchscore import Summary, read_shard, score_files, score_shard, shards
+from sink import JsonlSink
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TEXTS = ['I love this great day', 'This is terrible and sad', 'A tweet',
+         'RT @pybites: what a wonderful, happy release', 'Bad, bad news']
+
+
+def tweet_lines(count):
+    return [json.dumps({'id_str': str(i), 'text': TEXTS[i % len(TEXTS)]})
+            .encode() + b'\n' for i in range(count)]
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lines = tweet_lines(50)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data, opener=open):
+        path = os.path.join(self.tmp.name, name)
+        with opener(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def read_all(self, paths, shard_bytes):
+        return [line for shard in shards(paths, shard_bytes)
+                for line in read_shard(*shard)]
+
+    def test_every_line_once(self):
+        data = b''.join(self.lines)
+        path = self.write('tweets.json', data)
+        # the first line's length: shards starting right at a line start
+        for shard_bytes in [1, 7, len(self.lines[0]), len(self.lines[0]) + 1,
+                            100, 1000, len(data) - 1, len(data), 10 ** 6]:
+            self.assertEqual(self.read_all([path], shard_bytes), self.lines,
+                             shard_bytes)
+
+    def test_shard_ranges(self):
+        path = self.write('tweets.json', b'x' * 25)
+        self.assertEqual([shard[1:] for shard in shards([path], 10)],
+                         [(0, 10), (10, 20), (20, 25)])
+        self.assertEqual(list(shards([self.write('empty.json', b'')], 10)), [])
+
+    def test_no_trailing_newline(self):
+        data = b''.join(self.lines).rstrip(b'\n')
+        path = self.write('tweets.json', data)
+        self.assertEqual(b''.join(self.read_all([path], 64)), data)
+
+    def test_compressed_whole(self):
+        path = self.write('tweets.json.gz', b''.join(self.lines), gzip.open)
+        self.assertEqual(list(shards([path], 10)), [(path, 0, None)])
+        self.assertEqual(self.read_all([path], 10), self.lines)
+
+    def test_compressed_by_content(self):
+        # a gzip capture without a .gz name still isn't split
+        path = self.write('capture.json', b''.join(self.lines), gzip.open)
+        self.assertEqual(list(shards([path], 10)), [(path, 0, None)])
+        self.assertEqual(self.read_all([path], 10), self.lines)
+
+
+class TestSummary(unittest.TestCase):
+    def test_add_and_merge(self):
+        scores = [(0.5, 0.6), (-0.2, 0.4), (0.0, 0.0), (0.8, 1.0),
+                  (-0.7, 0.9), (0.0, 0.1)]
+        whole = Summary()
+        parts = [Summary(), Summary(), Summary()]
+        for i, score in enumerate(scores):
+            whole.add(*score)
+            parts[i % 3].add(*score)
+        merged = sum(parts, Summary())
+        self.assertEqual(vars(merged).keys(), vars(whole).keys())
+        for name, value in vars(whole).items():
+            self.assertAlmostEqual(getattr(merged, name), value)
+        self.assertEqual((merged.tweets, merged.positive, merged.negative,
+                          merged.neutral), (6, 2, 2, 2))
+        self.assertEqual(merged.report(), whole.report())
+        self.assertIn('positive: 2 (33.3%)', merged.report())
+
+    def test_empty(self):
+        self.assertIn('tweets: 0', Summary().report())
+        self.assertEqual(vars(Summary() + Summary()), vars(Summary()))
+
+
+class TestScoreFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plain = os.path.join(self.tmp.name, 'tweets.json')
+        with open(self.plain, 'wb') as f:
+            f.writelines(tweet_lines(40))
+        _, self.expected = score_shard((self.plain, 0, None))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def score_sink_output(self, compression):
+        prefix = os.path.join(self.tmp.name, compression)
+        with JsonlSink(prefix, compression=compression) as sink:
+            for line in tweet_lines(40):
+                sink.put(json.loads(line))
+        output = os.path.join(self.tmp.name, 'scores.csv')
+        return score_files(sink.files, output, processes=2, shard_bytes=300)
+
+    def test_gzip(self):
+        summary = self.score_sink_output('gzip')
+        self.assertEqual(summary.report(), self.expected.report())
+
+    @unittest.skipUnless(zstandard, 'needs zstandard')
+    def test_zstd(self):
+        summary = self.score_sink_output('zstd')
+        self.assertEqual(summary.report(), self.expected.report())
+
+    def test_matches_one_shard(self):
+        output = os.path.join(self.tmp.name, 'scores.csv')
+        summary = score_files([self.plain], output, processes=2,
+                              shard_bytes=300)
+        rows, _ = score_shard((self.plain, 0, None))
+        with open(output, newline='') as f:
+            written = list(csv.DictReader(f))
+        self.assertEqual(summary.report(), self.expected.report())
+        self.assertEqual(
+            sorted((row['id'], float(row['polarity'])) for row in written),
+            sorted((id_, polarity) for id_, polarity, _ in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
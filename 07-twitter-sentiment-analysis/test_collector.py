@@ -0,0 +1,150 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import collector
+from collector import Checkpoint, backoff, collect, error_kind
+from test_sink import read_records
+from sink import JsonlSink
+
+
+def tweet(id_, lang='en'):
+    return {'id': id_, 'lang': lang, 'text': 'tweet {}'.format(id_)}
+
+
+class FakeStream(BaseHTTPRequestHandler):
+    """Streams the next of server.connections, a list of lines, per
+    request. An empty line is a keep-alive, a dict a message and a str is
+    written as is, cut off tweets for instance. The connection ends
+    after the last line. No connections left: 420."""
+    protocol_version = 'HTTP/1.0'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests += 1
+        if not self.server.connections:
+            self.send_error(420, 'Enhance Your Calm')
+            return
+        lines = self.server.connections.pop(0)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        for line in lines:
+            if isinstance(line, dict):
+                line = json.dumps(line) + '\r\n'
+            self.wfile.write(line.encode())
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordingCheckpoint(Checkpoint):
+    def save(self):
+        self.saves.append((self.count, self.last_id))
+        super().save()
+
+
+class TestCollect(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.tmp.name, 'data')
+        self.path = os.path.join(self.tmp.name, 'collect.json')
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeStream)
+        self.server.connections = []
+        self.server.requests = 0
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.url = 'http://127.0.0.1:{}/filter.json'.format(
+            self.server.server_port)
+        self.sleeps = []
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def collect(self, max_tweets, checkpoint=None, **kwargs):
+        sink = JsonlSink(self.prefix, **kwargs)
+        checkpoint = collect('python', sink, max_tweets,
+                             checkpoint or Checkpoint(self.path),
+                             url=self.url, sleep=self.sleeps.append,
+                             max_retries=2)
+        return checkpoint, sink
+
+    def test_reconnect_and_resume(self):
+        self.server.connections = [
+            # breaks off in the middle of a tweet
+            [tweet(1), '\r\n', tweet(2), {'limit': {'track': 3}},
+             tweet(3, 'nl'), tweet(4), '{"id": 5, "la'],
+            # the stream may repeat tweets after a reconnect
+            [tweet(3), tweet(4), tweet(5), tweet(6)],
+            [tweet(7), tweet(8), tweet(9)],
+        ]
+        checkpoint, sink = self.collect(6)
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual((checkpoint.count, checkpoint.last_id), (6, 7))
+        self.assertEqual(Checkpoint(self.path).count, 6)
+        self.assertEqual([record['id'] for record in read_records(sink.files)],
+                         [1, 2, 4, 5, 6, 7])
+
+        # a new run picks up after the checkpoint
+        self.server.connections = [[tweet(i) for i in range(5, 12)]]
+        checkpoint, sink = self.collect(9, Checkpoint(self.path))
+        self.assertEqual((checkpoint.count, checkpoint.last_id), (9, 10))
+        self.assertEqual([record['id'] for record in read_records(sink.files)],
+                         [8, 9, 10])
+        self.assertEqual(len(Checkpoint(self.path).files), 2)
+
+    def test_checkpoint_only_written(self):
+        self.server.connections = [[tweet(i) for i in range(1, 6)]]
+        checkpoint = RecordingCheckpoint(self.path)
+        checkpoint.saves = []
+        with patch.object(collector, 'CHECKPOINT_EVERY', 0):
+            # nothing gets written before the sink is closed
+            checkpoint, sink = self.collect(5, checkpoint, flush_interval=60)
+        self.assertEqual(checkpoint.saves[:-1],
+                         [(0, None)] * (len(checkpoint.saves) - 1))
+        self.assertEqual(checkpoint.saves[-1], (5, 5))
+
+    def test_gives_up(self):
+        checkpoint = Checkpoint(self.path)
+        with self.assertRaises(requests.HTTPError):
+            self.collect(5, checkpoint)
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.sleeps, [60, 120])
+        self.assertEqual(Checkpoint(self.path).count, 0)
+
+
+class TestBackoff(unittest.TestCase):
+    def http_error(self, status):
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(response=response)
+
+    def test_kinds(self):
+        self.assertEqual(error_kind(requests.ConnectionError()), 'network')
+        self.assertEqual(error_kind(self.http_error(503)), 'http')
+        self.assertEqual(error_kind(self.http_error(429)), 'rate limit')
+
+    def test_backoff(self):
+        network = requests.ConnectionError()
+        self.assertEqual([backoff(network, i) for i in (0, 1, 100)],
+                         [0.25, 0.5, 16])
+        http = self.http_error(500)
+        self.assertEqual([backoff(http, i) for i in (0, 1, 100)],
+                         [5, 10, 320])
+        limited = self.http_error(420)
+        self.assertEqual([backoff(limited, i) for i in (0, 1, 100)],
+                         [60, 120, 960])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import gc
+import gzip
+import json
+import os
+import tempfile
+import unittest
+import warnings
+
+from sentiment import (EXTENDED_TEXT, TEXT, TEXT_FIELDS, get_field, get_text,
+                       open_input, read_json)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TWEETS = [
+    {'id': 1, 'text': 'Plain tweet', 'user': {'screen_name': 'pybites'}},
+    {'id': 2, 'full_text': 'Extended tweet mode'},
+    {'id': 3, 'text': 'RT @pybites: cut off...',
+     'retweeted_status': {'extended_tweet': {'full_text': 'The whole one'}}},
+]
+
+
+class TestReadJson(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        lines = [json.dumps(tweet).encode() for tweet in TWEETS]
+        # blank lines (keep-alives) get skipped
+        self.data = b'\n'.join(lines[:2] + [b''] + lines[2:]) + b'\n\n'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, opener=open):
+        path = os.path.join(self.tmp.name, name)
+        with opener(path, 'wb') as f:
+            f.write(self.data)
+        return path
+
+    def test_plain(self):
+        self.assertEqual(list(read_json(self.write('data.json'))), TWEETS)
+
+    def test_gzip(self):
+        # detected by content, not by name
+        path = self.write('data.json', gzip.open)
+        self.assertEqual(list(read_json(path)), TWEETS)
+
+    @unittest.skipUnless(zstandard, 'needs zstandard')
+    def test_zstd(self):
+        path = self.write('data.json.zst', zstandard.open)
+        self.assertEqual(list(read_json(path)), TWEETS)
+
+    def test_fields(self):
+        path = self.write('data.json')
+        self.assertEqual(
+            list(read_json(path, ['id', 'user.screen_name'])),
+            [{'id': 1, 'user.screen_name': 'pybites'},
+             {'id': 2, 'user.screen_name': None},
+             {'id': 3, 'user.screen_name': None}])
+        texts = [get_text(tweet) for tweet in read_json(path, TEXT_FIELDS)]
+        self.assertEqual(texts, ['Plain tweet', 'Extended tweet mode',
+                                 'The whole one'])
+
+    def test_loads(self):
+        lines = []
+
+        def loads(line):
+            lines.append(line)
+            return json.loads(line)
+        path = self.write('data.json')
+        self.assertEqual(list(read_json(path, ['id'], loads=loads)),
+                         [{'id': 1}, {'id': 2}, {'id': 3}])
+        self.assertEqual(len(lines), 3)
+        self.assertIsInstance(lines[0], bytes)
+
+    def test_files_closed(self):
+        paths = [self.write('data.json'), self.write('data.gz', gzip.open)]
+        if zstandard:
+            paths.append(self.write('data.zst', zstandard.open))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for path in paths:
+                self.assertEqual(len(list(read_json(path))), 3)
+                with open_input(path) as f:
+                    f.readline()
+            gc.collect()
+        self.assertEqual([w for w in caught
+                          if issubclass(w.category, ResourceWarning)], [])
+
+
+class TestGetField(unittest.TestCase):
+    def test_get_field(self):
+        tweet = TWEETS[2]
+        self.assertEqual(get_field(tweet, EXTENDED_TEXT), 'The whole one')
+        self.assertEqual(get_field(tweet, TEXT), tweet['text'])
+        self.assertIsNone(get_field(tweet, 'user.screen_name'))
+        self.assertIsNone(get_field(tweet, 'text.length'))
+        self.assertEqual(get_field({EXTENDED_TEXT: 'flat'}, EXTENDED_TEXT),
+                         'flat')
+
+
+if __name__ == "__main__":
+    unittest.main()
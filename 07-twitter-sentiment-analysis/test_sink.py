@@ -0,0 +1,136 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sink import JsonlSink
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def records(count, start=0):
+    return [{'id': i, 'text': 'tweet {}'.format(i)}
+            for i in range(start, start + count)]
+
+
+def read_records(paths, opener=open):
+    lines = []
+    for path in paths:
+        with opener(path, 'rb') as f:
+            lines.extend(f.read().splitlines())
+    return [json.loads(line) for line in lines]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(0.01)
+
+
+class BlockedSink(JsonlSink):
+    """Sink whose writer thread waits for go to be set"""
+
+    def __init__(self, **kwargs):
+        self.go = threading.Event()
+        super().__init__(**kwargs)
+
+    def _run(self):
+        self.go.wait()
+        super()._run()
+
+
+class TestJsonlSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.tmp.name, 'data')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write(self):
+        with JsonlSink(self.prefix) as sink:
+            for record in records(100):
+                self.assertTrue(sink.put(record))
+        self.assertEqual(sink.written, 100)
+        self.assertEqual(sink.dropped, 0)
+        self.assertEqual(sink.pending, 0)
+        self.assertEqual(len(sink.files), 1)
+        self.assertTrue(sink.files[0].startswith(self.prefix + '_'))
+        self.assertEqual(read_records(sink.files), records(100))
+        sink.close()  # closing twice is fine
+
+    def test_flush_bytes(self):
+        sink = JsonlSink(self.prefix, flush_bytes=1, flush_interval=60)
+        sink.put(records(1)[0])
+        wait_for(lambda: sink.written == 1)
+        self.assertEqual(read_records(sink.files), records(1))
+        sink.close()
+
+    def test_flush_interval(self):
+        sink = JsonlSink(self.prefix, flush_interval=0.05)
+        for record in records(3):
+            sink.put(record)
+        wait_for(lambda: sink.written == 3)
+        self.assertEqual(read_records(sink.files), records(3))
+        sink.close()
+
+    def test_no_flush_before_due(self):
+        sink = JsonlSink(self.prefix, flush_interval=60)
+        sink.put(records(1)[0])
+        wait_for(lambda: sink._queue.empty())
+        self.assertEqual((sink.written, sink.pending, sink.files), (0, 1, []))
+        sink.close()
+        self.assertEqual(sink.written, 1)
+
+    def test_rotation(self):
+        line = len(json.dumps(records(1)[0])) + 1
+        with JsonlSink(self.prefix, max_bytes=5 * line, flush_bytes=1) as sink:
+            for record in records(12):
+                sink.put(record)
+        self.assertEqual(len(sink.files), 3)
+        self.assertEqual(len(set(sink.files)), 3)
+        self.assertEqual([len(read_records([path])) for path in sink.files],
+                         [5, 5, 2])
+        self.assertEqual(read_records(sink.files), records(12))
+
+    def test_drops(self):
+        sink = BlockedSink(prefix=self.prefix, queue_size=5)
+        puts = [sink.put(record) for record in records(8)]
+        self.assertEqual(puts, [True] * 5 + [False] * 3)
+        self.assertEqual(sink.dropped, 3)
+        sink.go.set()
+        sink.close()
+        self.assertEqual(sink.written, 5)
+        self.assertEqual(read_records(sink.files), records(5))
+
+    def test_gzip(self):
+        with JsonlSink(self.prefix, compression='gzip') as sink:
+            for record in records(10):
+                sink.put(record)
+        self.assertTrue(sink.files[0].endswith('.json.gz'))
+        self.assertEqual(read_records(sink.files, gzip.open), records(10))
+
+    @unittest.skipUnless(zstandard, 'needs zstandard')
+    def test_zstd(self):
+        with JsonlSink(self.prefix, compression='zstd') as sink:
+            for record in records(10):
+                sink.put(record)
+        self.assertTrue(sink.files[0].endswith('.json.zst'))
+        self.assertEqual(read_records(sink.files, zstandard.open),
+                         records(10))
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            JsonlSink(self.prefix, compression='bz2')
+
+
+if __name__ == "__main__":
+    unittest.main()
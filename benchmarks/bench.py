@@ -0,0 +1,245 @@
+#! /usr/bin/python3
+"""Microbenchmarks for the word value (01) and word game (02) hot paths.
+
+    python benchmarks/bench.py            # run, compare with baseline.json
+    python benchmarks/bench.py --save     # run, store as the new baseline
+    python benchmarks/bench.py -k game    # only benchmarks matching 'game'
+
+Exits with 1 when a benchmark's ops/sec dropped more than --threshold
+below the stored baseline. Baseline numbers are machine specific, so
+baseline.json is local only (git ignores it). To measure against the
+original code, save the baseline from a checkout of it:
+
+    git worktree add /tmp/orig <commit>
+    python benchmarks/bench.py --root /tmp/orig --max-rack 7 --save
+    python benchmarks/bench.py --max-rack 7
+
+Benchmarks of code that checkout doesn't have yet are skipped. The
+original find_optimal_word tries every permutation of the rack, keep
+the racks at 7 tiles for it.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+SEED = 2017
+THRESHOLD = 0.25
+MAX_CALLS = 10000
+MAX_SECONDS = 2.0
+RACK_SIZES = range(7, 13)
+MAX_RACK = 12
+VOWELS = set('AEIOU')
+
+BENCHMARKS = []
+
+
+def benchmark(challenge):
+    """Register a setup function for a benchmark run in challenge's
+    directory, it returns the function to time"""
+    def register(setup):
+        BENCHMARKS.append((f'{challenge}.{setup.__name__}', challenge, setup))
+        return setup
+    return register
+
+
+@contextmanager
+def challenge_dir(challenge, root=ROOT):
+    """Run inside a challenge directory like its tests do, and forget its
+    modules afterwards since every challenge has its own data.py"""
+    path = os.path.join(root, challenge)
+    cwd, modules = os.getcwd(), set(sys.modules)
+    os.chdir(path)
+    sys.path.insert(0, path)
+    try:
+        yield
+    finally:
+        sys.path.remove(path)
+        os.chdir(cwd)
+        for name in set(sys.modules) - modules:
+            del sys.modules[name]
+
+
+def racks(rng, count=50):
+    """Racks drawn from data.POUCH, which every version of the game has,
+    so all checkouts get the same racks"""
+    from data import POUCH
+    sizes = [size for size in RACK_SIZES if size <= MAX_RACK] or [MAX_RACK]
+    drawn = []
+    while len(drawn) < count:
+        rack = rng.sample(POUCH, rng.choice(sizes))
+        if VOWELS.intersection(rack):
+            drawn.append(rack)
+    return drawn
+
+
+def time_calls(func, max_calls=MAX_CALLS, max_seconds=MAX_SECONDS):
+    """Call func() until max_calls or max_seconds, return sorted
+    per-call durations in seconds"""
+    func()  # warm up caches
+    durations = []
+    deadline = time.perf_counter() + max_seconds
+    while len(durations) < max_calls:
+        start = time.perf_counter()
+        func()
+        end = time.perf_counter()
+        durations.append(end - start)
+        if end > deadline:
+            break
+    return sorted(durations)
+
+
+def summarize(durations):
+    def percentile(p):
+        return durations[min(len(durations) - 1, int(len(durations) * p))]
+    return {'calls': len(durations),
+            'ops': len(durations) / sum(durations),
+            'p50': percentile(0.50),
+            'p99': percentile(0.99)}
+
+
+# challenge 01
+
+@benchmark('01-word-value')
+def calc_word_value():
+    from wordvalue import calc_word_value, load_words
+    words = random.Random(SEED).sample(load_words(), 1000)
+    cycle = itertools.cycle(words)
+    return lambda: calc_word_value(next(cycle))
+
+
+@benchmark('01-word-value')
+def max_word_value():
+    from wordvalue import max_word_value
+    return max_word_value
+
+
+@benchmark('01-word-value')
+def max_word_value_list():
+    from wordvalue import load_words, max_word_value
+    words = load_words()
+    return lambda: max_word_value(words)
+
+
+@benchmark('01-word-value')
+def load_words():
+    from wordvalue import load_words
+    return load_words
+
+
+# challenge 02
+
+@benchmark('02-word-value-game')
+def find_optimal_word():
+    import game
+    if hasattr(game, 'word_graph'):
+        game.word_graph()  # build the DAWG outside the timing
+    find_optimal_word = game.find_optimal_word
+    cycle = itertools.cycle(racks(random.Random(SEED)))
+    return lambda: find_optimal_word(next(cycle))
+
+
+@benchmark('02-word-value-game')
+def is_valid():
+    from game import find_optimal_word, is_valid
+    plays = [(rack, find_optimal_word(rack))
+             for rack in racks(random.Random(SEED))]
+    cycle = itertools.cycle(plays)
+    return lambda: is_valid(*next(cycle))
+
+
+@benchmark('02-word-value-game')
+def open_dictionary():
+    from data import COMPILED
+    from dictbin import CompiledDictionary
+    return lambda: CompiledDictionary(COMPILED)
+
+
+@benchmark('02-word-value-game')
+def read_dictionary_txt():
+    from data import read_words
+    return read_words
+
+
+def run(pattern='', root=ROOT):
+    results = {}
+    for name, challenge, setup in BENCHMARKS:
+        if pattern not in name:
+            continue
+        with challenge_dir(challenge, root):
+            try:
+                func = setup()
+            except ImportError as exc:
+                print(f'{name:<40} skipped: {exc}')
+                continue
+            results[name] = summarize(time_calls(func))
+        print(format_result(name, results[name]))
+    return results
+
+
+def format_result(name, result):
+    return (f"{name:<40} {result['ops']:>12,.1f} ops/s  "
+            f"p50 {result['p50'] * 1e6:>11,.1f}us  "
+            f"p99 {result['p99'] * 1e6:>11,.1f}us")
+
+
+def regressions(results, baseline, threshold):
+    """Yield (name, ops, baseline ops) for every benchmark that got more
+    than threshold slower"""
+    for name, result in results.items():
+        if name in baseline:
+            before = baseline[name]['ops']
+            if result['ops'] < before * (1 - threshold):
+                yield name, result['ops'], before
+
+
+def main():
+    global MAX_RACK
+    parser = argparse.ArgumentParser(
+        description='Benchmark the word value and word game hot paths')
+    parser.add_argument('-k', '--pattern', default='',
+                        help='only run benchmarks with this in their name')
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed ops/sec drop, default %(default)s')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--root', default=ROOT,
+                        help='checkout to benchmark, default this one')
+    parser.add_argument('--max-rack', type=int, default=MAX_RACK,
+                        help='largest rack drawn, default %(default)s')
+    args = parser.parse_args()
+
+    MAX_RACK = args.max_rack
+    results = run(args.pattern, os.path.abspath(args.root))
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'saved baseline to {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        print('no baseline yet, run with --save first')
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failed = list(regressions(results, baseline, args.threshold))
+    for name, ops, before in failed:
+        print(f'REGRESSION {name}: {ops:,.1f} ops/s, '
+              f'baseline {before:,.1f} ops/s')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()